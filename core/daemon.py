@@ -0,0 +1,124 @@
+"""
+Persistent Model-Server Daemon
+
+Keeps the loaded Whisper model resident in one process and accepts
+transcription jobs over a Unix domain socket. Each CLI invocation normally
+pays 10-30 s to deserialize the model and move it to the GPU; with the
+daemon that cost is paid once, and subsequent --client invocations submit
+files to the warm server.
+
+Protocol: one JSON object per line. Request:
+    {"file": "/abs/path/to/media", "config_override": {...}}
+Response:
+    {"ok": true, "vtt": "/abs/path/to/output.vtt"}
+    {"ok": false, "error": "..."}
+"""
+
+import asyncio
+import json
+import os
+
+DEFAULT_SOCKET_PATH = "/tmp/transcribe_jp.sock"
+
+
+def run_daemon(model, output_dir, config, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Serve transcription jobs until interrupted.
+
+    Jobs run one at a time (the model owns the GPU) in a worker thread so
+    the event loop keeps accepting connections while transcribing.
+
+    Args:
+        model: Loaded Whisper model, kept resident across jobs
+        output_dir: Directory for output VTT files
+        config: Base configuration dict; requests may override keys
+        socket_path: Unix socket to listen on
+    """
+    from core.pipeline import run_pipeline
+
+    lock = asyncio.Lock()
+
+    async def process(request):
+        media_path = request.get("file")
+        if not media_path or not os.path.exists(media_path):
+            return {"ok": False, "error": f"file not found: {media_path}"}
+
+        job_config = dict(config)
+        job_config.update(request.get("config_override") or {})
+
+        loop = asyncio.get_running_loop()
+        async with lock:
+            try:
+                vtt_path = await loop.run_in_executor(
+                    None, run_pipeline, media_path, model, output_dir, job_config)
+            except Exception as e:
+                return {"ok": False, "error": str(e)}
+        return {"ok": True, "vtt": str(vtt_path)}
+
+    async def handle(reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                response = {"ok": False, "error": "invalid JSON request"}
+            else:
+                response = await process(request)
+            writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def serve():
+        if os.path.exists(socket_path):
+            # Stale socket from a previous daemon run
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        print(f"\nDaemon listening on {socket_path} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nDaemon stopped")
+    finally:
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def submit_job(media_path, config_override=None, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Submit one media file to a running daemon.
+
+    Args:
+        media_path: Path to the media file (made absolute for the server)
+        config_override: Optional dict of config keys to override
+        socket_path: Unix socket the daemon listens on
+
+    Returns:
+        Response dict from the daemon ({"ok": ..., ...})
+    """
+    async def request():
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        payload = {"file": os.path.abspath(media_path)}
+        if config_override:
+            payload["config_override"] = config_override
+        writer.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        await writer.drain()
+        line = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        if not line:
+            return {"ok": False, "error": "empty response from daemon"}
+        return json.loads(line)
+
+    try:
+        return asyncio.run(request())
+    except (ConnectionRefusedError, FileNotFoundError):
+        return {"ok": False, "error": f"no daemon listening on {socket_path} (start one with --daemon)"}
@@ -14,12 +14,11 @@ Coordinates all 9 processing stages in a clean, linear flow:
 """
 
 from pathlib import Path
-import whisper
 
 from core.display import display_pipeline_summary
 
 
-def run_pipeline(media_path, model, output_dir, config):
+def run_pipeline(media_path, model, output_dir, config, preprocessed=None):
     """
     Execute the complete transcription pipeline.
 
@@ -28,6 +27,9 @@ def run_pipeline(media_path, model, output_dir, config):
         model: Loaded Whisper model
         output_dir: Directory for output files
         config: Configuration dict
+        preprocessed: Optional (processed_path, temp_file) pair from a
+            Stage 1 pass that already ran (e.g. prefetched while the
+            previous file held the GPU)
 
     Returns:
         Path to generated VTT file
@@ -48,7 +50,11 @@ def run_pipeline(media_path, model, output_dir, config):
     # STAGE 1: Audio Preprocessing
     # ========================================
     print("\n[Stage 1/9] Audio Preprocessing")
-    processed_path, temp_file = preprocess_audio_volume(media_path, config, output_dir)
+    if preprocessed is not None:
+        processed_path, temp_file = preprocessed
+        print("  - Using prefetched preprocessing result")
+    else:
+        processed_path, temp_file = preprocess_audio_volume(media_path, config, output_dir)
 
     try:
         # ========================================
@@ -0,0 +1,145 @@
+"""
+Whisper Backend Selection
+
+Loads either the reference openai-whisper implementation or the
+CTranslate2-based faster-whisper backend, selected via whisper.backend in
+config.json. The faster backend runs int8-quantized GEMMs and halves
+KV-cache traffic, which is typically several times faster at equal WER.
+It is wrapped in an adapter that accepts the same transcribe() parameters
+and returns the same result dict shape, so the 9-stage pipeline stays
+backend-agnostic.
+"""
+
+
+def load_whisper_model(config, device):
+    """
+    Load the configured Whisper backend.
+
+    Args:
+        config: Configuration dict (whisper.backend: "openai" or "faster")
+        device: Device string ("cuda" or "cpu")
+
+    Returns:
+        Model object exposing transcribe(audio, **params) with
+        openai-whisper semantics
+    """
+    whisper_config = config.get("whisper", {})
+    backend = whisper_config.get("backend", "openai")
+    model_name = whisper_config.get("model", "large-v3")
+
+    if backend == "openai":
+        import whisper
+        if device == "cuda":
+            _enable_cuda_fast_math()
+        model = whisper.load_model(model_name, device=device)
+        if whisper_config.get("autocast", False) and device == "cuda":
+            _enable_autocast(model, device)
+        if whisper_config.get("compile", False):
+            # Inductor fuses the encoder's pointwise ops and trims kernel
+            # launch overhead; opt-in because the first batch pays compile time
+            import torch
+            model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+            print("  - torch.compile enabled for the encoder")
+        return model
+
+    if backend == "faster":
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper package not installed. Install with: pip install faster-whisper")
+
+        # int8 weights halve memory traffic; pair them with fp16 activations
+        # on GPU, plain int8 on CPU
+        default_compute = "int8_float16" if device == "cuda" else "int8"
+        compute_type = whisper_config.get("compute_type", default_compute)
+        print(f"  - Using faster-whisper backend (compute_type: {compute_type})")
+        model = WhisperModel(model_name, device=device, compute_type=compute_type)
+
+        if whisper_config.get("batched", False):
+            # Batched pipeline runs several 30s windows through the encoder
+            # at once, so short files no longer leave the GPU at batch size 1
+            from faster_whisper import BatchedInferencePipeline
+            batch_size = whisper_config.get("batch_size", 16)
+            print(f"  - Batched inference enabled (batch_size: {batch_size})")
+            return FasterWhisperAdapter(BatchedInferencePipeline(model), batch_size=batch_size)
+
+        return FasterWhisperAdapter(model)
+
+    raise ValueError(f"Unknown whisper backend: {backend} (expected 'openai' or 'faster')")
+
+
+def _enable_autocast(model, device):
+    """Wrap model.transcribe in torch.autocast at the GPU's best half precision.
+
+    Compute capability 8.0 (Ampere) and newer run bf16 at full tensor-core
+    rate with a wider exponent range than fp16; older GPUs get fp16. The
+    wrapper keeps every mixed-precision-safe op off the FP32 fallback path.
+    """
+    import torch
+    major, _ = torch.cuda.get_device_capability(0)
+    dtype = torch.bfloat16 if major >= 8 else torch.float16
+    inner = model.transcribe
+
+    def transcribe(audio, **params):
+        with torch.autocast(device, dtype=dtype):
+            return inner(audio, **params)
+
+    model.transcribe = transcribe
+    print(f"  - Autocast enabled ({'bf16' if dtype is torch.bfloat16 else 'fp16'})")
+
+
+def _enable_cuda_fast_math():
+    """Allow TF32 matmuls and cuDNN autotuning on CUDA devices.
+
+    TF32 is accuracy-neutral at Whisper's scale on Ampere and newer GPUs,
+    and cudnn.benchmark amortizes convolution autotuning across files.
+    """
+    import torch
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+
+
+class FasterWhisperAdapter:
+    """Adapts faster_whisper.WhisperModel to openai-whisper's transcribe API"""
+
+    # openai-whisper options with no faster-whisper counterpart
+    _UNSUPPORTED = ('verbose', 'fp16')
+
+    def __init__(self, model, batch_size=None):
+        self.model = model
+        self.batch_size = batch_size
+
+    def transcribe(self, audio, **params):
+        """Run faster-whisper and reshape its output to openai-whisper's dict"""
+        for key in self._UNSUPPORTED:
+            params.pop(key, None)
+        if self.batch_size is not None:
+            params['batch_size'] = self.batch_size
+        # openai-whisper calls this option logprob_threshold
+        if 'logprob_threshold' in params:
+            params['log_prob_threshold'] = params.pop('logprob_threshold')
+
+        segments_iter, info = self.model.transcribe(audio, **params)
+
+        segments = []
+        texts = []
+        for segment in segments_iter:
+            words = [
+                {'start': word.start, 'end': word.end, 'word': word.word,
+                 'probability': word.probability}
+                for word in (segment.words or [])
+            ]
+            segments.append({
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'words': words,
+            })
+            texts.append(segment.text)
+
+        return {
+            'text': ''.join(texts),
+            'segments': segments,
+            'language': info.language,
+        }
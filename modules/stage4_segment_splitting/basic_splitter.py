@@ -1,5 +1,6 @@
 """Segment splitting and line breaking with timing"""
 
+from shared.segment import Segment
 from shared.text_utils import simplify_repetitions
 
 
@@ -22,7 +23,7 @@ def split_segment_with_timing(segment, config):
     words = segment.get('words', [])
 
     if len(text) <= max_length:
-        return [(start_time, end_time, text, words if words else [])]
+        return [Segment(start_time, end_time, text, words if words else [])]
 
     if not words:
         # Fallback: proportional timing based on character count
@@ -102,9 +103,9 @@ def split_segment_with_timing(segment, config):
         chunk_text = ''.join([w['word'] for w in chunk_words])
 
         # Return both tuple format (for compatibility) and preserve words for LLM timing
-        result.append((chunk_start, chunk_end, chunk_text, chunk_words))
+        result.append(Segment(chunk_start, chunk_end, chunk_text, chunk_words))
 
-    return result if result else [(start_time, end_time, text, [])]
+    return result if result else [Segment(start_time, end_time, text, [])]
 
 
 def split_by_character_proportion(text, start_time, end_time, max_length):
@@ -163,7 +164,7 @@ def split_by_character_proportion(text, start_time, end_time, max_length):
         chunk_chars = len(chunk)
         chunk_duration = duration * (chunk_chars / total_chars)
         chunk_end = min(current_time + chunk_duration, end_time)
-        result.append((current_time, chunk_end, chunk, []))
+        result.append(Segment(current_time, chunk_end, chunk, []))
         current_time = chunk_end
 
     return result
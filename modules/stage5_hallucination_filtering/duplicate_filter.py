@@ -3,16 +3,27 @@
 import re
 
 
+def _flush_char_run(run):
+    """Collapse a run of identical single-character segments into one segment"""
+    start_time, end_time, char, count, words = run
+    if count > 1:
+        # Combine into "あ、あ、あ" format
+        return (start_time, end_time, '、'.join([char] * count), words)
+    # Keep single character as-is
+    return (start_time, end_time, char, words)
+
+
 def merge_single_char_segments(sub_segments):
     """Merge consecutive single-character segments if they're the same character"""
     if not sub_segments:
         return sub_segments
 
     merged = []
-    i = 0
+    # Pending run of identical single-character segments:
+    # [start_time, end_time, char, count, words]
+    run = None
 
-    while i < len(sub_segments):
-        seg = sub_segments[i]
+    for seg in sub_segments:
         if len(seg) == 4:
             start_time, end_time, text, words = seg
         else:
@@ -20,42 +31,25 @@ def merge_single_char_segments(sub_segments):
             words = []
         text = text.strip()
 
-        # Check if this is a single character segment
         if len(text) == 1:
-            # Look ahead for more segments with the same character
-            same_chars = [text]
-            merged_words = words.copy() if words else []
-            j = i + 1
-
-            while j < len(sub_segments):
-                next_seg = sub_segments[j]
-                if len(next_seg) == 4:
-                    next_start, next_end, next_text, next_words = next_seg
-                    merged_words.extend(next_words if next_words else [])
-                else:
-                    next_start, next_end, next_text = next_seg
-                next_text = next_text.strip()
-
-                # If next segment is also the same single character
-                if len(next_text) == 1 and next_text == text:
-                    same_chars.append(next_text)
-                    end_time = next_end  # Extend end time
-                    j += 1
-                else:
-                    break
-
-            # Combine into "あ、あ、あ" format if multiple found
-            if len(same_chars) > 1:
-                combined_text = '、'.join(same_chars)
-                merged.append((start_time, end_time, combined_text, merged_words))
-            else:
-                # Keep single character as-is
-                merged.append((start_time, end_time, text, words))
-
-            i = j  # Skip all merged segments
+            if run is not None and run[2] == text:
+                # Extend the current run
+                run[1] = end_time
+                run[3] += 1
+                if words:
+                    run[4].extend(words)
+                continue
+            if run is not None:
+                merged.append(_flush_char_run(run))
+            run = [start_time, end_time, text, 1, words.copy() if words else []]
         else:
+            if run is not None:
+                merged.append(_flush_char_run(run))
+                run = None
             merged.append((start_time, end_time, text, words))
-            i += 1
+
+    if run is not None:
+        merged.append(_flush_char_run(run))
 
     return merged
 
@@ -28,13 +28,17 @@ def realign_timing(sub_segments, model, media_path, config):
         config: Configuration dict
 
     Returns:
-        List of realigned segments
+        List of realigned segments. Early-return paths (disabled, empty input,
+        missing model/media) return the input list itself, not a copy.
     """
     timing_config = config.get("timing_realignment", {})
 
     if not timing_config.get("enable", False):
         return sub_segments
 
+    if not sub_segments:
+        return sub_segments
+
     if not model or not media_path:
         print("  - Warning: Timing realignment requires model and media_path")
         return sub_segments
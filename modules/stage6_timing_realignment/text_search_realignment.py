@@ -5,75 +5,62 @@ This method searches for the segment text in a window around the expected time.
 Sequential processing with neighbor revisit for cascading corrections.
 """
 
-import re
-from .utils import calculate_text_similarity, format_vtt_time, transcribe_for_realignment, find_text_in_words
+import bisect
+from rapidfuzz import fuzz
+from .utils import format_vtt_time, transcribe_for_realignment, find_text_in_words
+from shared.text_utils import normalize_text
 from shared.whisper_utils import load_audio_safely
 
+# Cheap skip thresholds for realign_segment_timing_text_search, hoisted to
+# module level so the common short-segment path does no config dict walking
+_MIN_SEGMENT_DURATION = 0.05   # seconds
+_MIN_TEXT_CHARS = 2            # shorter is likely just punctuation
+
 
 def find_text_in_transcription(target_text, whisper_result, search_window=5.0):
     """
     Find where target_text appears in Whisper transcription result.
 
     Strategy:
-    1. Try to match target text across segment combinations
-    2. Use early termination when excellent match found
-    3. Limit search scope to prevent O(n²) explosion
+    1. Concatenate the cleaned transcript into one string
+    2. Locate the target with a single bit-parallel partial_ratio_alignment scan
+    3. Map the matched character span back to segment timestamps
+
+    This replaces the old O(n²) segment-combination scan with one O(n) pass
+    over the concatenated transcript.
 
     Returns: (best_start, best_end, confidence) or (None, None, 0.0) if not found
     """
     if not whisper_result or 'segments' not in whisper_result:
         return None, None, 0.0
 
-    target_clean = re.sub(r'[、。！？\s]', '', target_text)
+    target_clean = normalize_text(target_text)
     if not target_clean:
         return None, None, 0.0
 
-    best_match = None
     best_similarity = 0.0
+    similarity_floor = 0.6
     segments = whisper_result['segments']
 
-    # Optimization: Limit the number of segments we combine
-    # Most matches will be within 3-5 segments
-    max_segments_to_combine = 5
-    target_length = len(target_text)
-
-    # Try combining segments starting from each position
-    for start_idx in range(len(segments)):
-        combined_text = ""
-
-        # Optimization: Limit how many segments we combine from this start point
-        end_limit = min(start_idx + max_segments_to_combine, len(segments))
-
-        for end_idx in range(start_idx, end_limit):
-            seg = segments[end_idx]
-            combined_text += seg.get('text', '').strip()
-
-            similarity = calculate_text_similarity(target_text, combined_text)
-
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = {
-                    'start': segments[start_idx]['start'],
-                    'end': seg['end'],
-                    'text': combined_text
-                }
-
-            # Early exit if we found an excellent match
-            if similarity >= 0.9:
-                return best_match['start'], best_match['end'], best_similarity
-
-            # Early stop if combined text is much longer than target
-            # (unlikely to improve by adding more)
-            if len(combined_text) > target_length * 1.5:
-                break
-
-        # Optimization: If we already found a very good match, don't search further
-        if best_similarity >= 0.85:
-            break
-
-    # If segment-level matching found a good match, return it
-    if best_match and best_similarity >= 0.6:
-        return best_match['start'], best_match['end'], best_similarity
+    # Concatenate cleaned segment texts, recording the exclusive end offset of
+    # each segment so matched character positions map back to segment indexes
+    full_text = ""
+    seg_end_offsets = []
+    for seg in segments:
+        full_text += normalize_text(seg.get('text', '').strip())
+        seg_end_offsets.append(len(full_text))
+
+    if full_text:
+        # Single bit-parallel scan over the whole transcript: returns the best
+        # matching window as (score, src span, dest span in full_text)
+        alignment = fuzz.partial_ratio_alignment(target_clean, full_text)
+        best_similarity = alignment.score / 100.0
+
+        if best_similarity >= similarity_floor and alignment.dest_end > alignment.dest_start:
+            # Map matched span back to segments via binary search on offsets
+            first_seg = bisect.bisect_right(seg_end_offsets, alignment.dest_start)
+            last_seg = bisect.bisect_right(seg_end_offsets, alignment.dest_end - 1)
+            return segments[first_seg]['start'], segments[last_seg]['end'], best_similarity
 
     # Fallback: Try word-level matching for more precision
     # This is more expensive but can find matches that segment-level missed
@@ -113,10 +100,14 @@ def realign_segment_timing_text_search(segment, audio, model, config, segment_in
     Returns:
         (new_start, new_end, text, words, adjusted) where adjusted is bool
     """
-    start_time, end_time, text, words = segment if len(segment) == 4 else (*segment, [])
-
-    # Skip very short segments (likely just punctuation)
-    if len(text.strip()) < 2:
+    # Handles both (start, end, text) and (start, end, text, words) without a
+    # length branch
+    start_time, end_time, text, *rest = segment
+    words = rest[0] if rest else []
+
+    # Skip very short segments before touching the config: a duration/length
+    # check is all that's needed to reject them
+    if (end_time - start_time) < _MIN_SEGMENT_DURATION or len(text.strip()) < _MIN_TEXT_CHARS:
         return start_time, end_time, text, words, False
 
     # Get configuration
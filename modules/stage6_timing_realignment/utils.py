@@ -2,9 +2,8 @@
 Shared utility functions for timing realignment methods.
 """
 
-import re
 from shared.whisper_utils import transcribe_with_config
-from shared.text_utils import calculate_text_similarity
+from shared.text_utils import calculate_text_similarity, normalize_text
 
 
 def find_text_in_words(target_text, words_with_timestamps, offset=0.0):
@@ -28,7 +27,7 @@ def find_text_in_words(target_text, words_with_timestamps, offset=0.0):
         return None, None, 0.0
 
     # Clean target text for matching
-    target_clean = re.sub(r'[、。！？\s]', '', target_text)
+    target_clean = normalize_text(target_text)
     if not target_clean:
         return None, None, 0.0
 
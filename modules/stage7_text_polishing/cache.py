@@ -0,0 +1,72 @@
+"""Deterministic response cache for LLM polishing calls"""
+
+import hashlib
+import json
+import os
+
+
+def cache_key(model, prompt, temperature):
+    """
+    Return a stable cache key for a polishing request, or None when the
+    request is not cacheable.
+
+    Only temperature == 0 requests are deterministic, so anything sampled at a
+    higher temperature is never cached.
+
+    Args:
+        model: Model identifier the request targets
+        prompt: Full prompt text
+        temperature: Sampling temperature
+
+    Returns:
+        SHA-256 hex digest of the request, or None if temperature > 0
+    """
+    if temperature and temperature > 0:
+        return None
+
+    payload = json.dumps({"model": model, "prompt": prompt}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Small disk-backed cache mapping request hashes to raw response text.
+
+    Each entry is one UTF-8 text file named by its SHA-256 key inside
+    cache_dir, with an in-memory dict in front so repeat lookups within a run
+    never touch the filesystem. Re-runs of the same transcript then skip the
+    API round trip (and token spend) entirely.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".txt")
+
+    def get(self, key):
+        """Return the cached response text for key, or None on miss"""
+        if key in self._memory:
+            return self._memory[key]
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                response_text = f.read()
+        except OSError:
+            return None
+
+        self._memory[key] = response_text
+        return response_text
+
+    def set(self, key, response_text):
+        """Store response text under key (memory + disk)"""
+        self._memory[key] = response_text
+        try:
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                f.write(response_text)
+        except OSError:
+            # Disk cache is best-effort; the in-memory entry still serves
+            # repeats within this run
+            pass
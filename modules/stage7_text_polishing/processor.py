@@ -1,99 +1,689 @@
 """LLM-powered subtitle polishing"""
 
 import json
-from shared.llm_utils import create_llm_provider, parse_json_response
+import random
+import re
+import time
+from itertools import zip_longest
+from typing import NamedTuple
+
+from shared.llm_utils import AnthropicProvider, create_llm_provider, parse_json_response
+from .cache import ResponseCache, cache_key
+from .rate_limiter import RateLimiter, estimate_tokens
+
+# orjson parses JSON in C, several times faster than the stdlib on the
+# multi-KB responses large batches produce; fall back to the stdlib path
+# when it is not installed
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# Markdown code fences around the JSON body, stripped in one precompiled pass
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+# Forced tool call giving schema-validated structured output from Anthropic
+# models: the SDK hands back parsed input instead of free-form JSON text,
+# so malformed-response repair never burns a retry round trip
+POLISH_TOOL = {
+    "name": "return_polished",
+    "description": "整形後の字幕テキストを返す",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "polished": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "入力と同じ順序の整形済みテキスト",
+            }
+        },
+        "required": ["polished"],
+    },
+}
+_POLISH_TOOL_CHOICE = {"type": "tool", "name": "return_polished"}
+
+# Transient API errors worth retrying: rate limits, timeouts, and server-side
+# 5xx failures. Anything else (auth, bad request) fails fast.
+try:
+    import anthropic as _anthropic
+    _RETRYABLE_ERRORS = (
+        _anthropic.RateLimitError,
+        _anthropic.APITimeoutError,
+        _anthropic.InternalServerError,
+    )
+except ImportError:
+    _RETRYABLE_ERRORS = ()
+
+
+def _with_retry(fn, max_attempts=3, base=1.0, limiter=None):
+    """
+    Call fn, retrying transient API errors with exponential backoff + jitter.
+
+    Sleeps base * 2**attempt plus uniform jitter between attempts, honoring a
+    retry-after response header when the server sends one. Re-raises on the
+    final attempt; the happy path pays no extra latency. When a limiter is
+    given, a 429 also drains its budget so other callers back off too.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except _RETRYABLE_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+
+            if limiter is not None and getattr(e, "status_code", None) == 429:
+                limiter.penalize()
+
+            delay = base * (2 ** attempt) + random.uniform(0, base)
+
+            # Honor the server's retry-after hint when present
+            headers = getattr(getattr(e, "response", None), "headers", None)
+            if headers is not None:
+                retry_after = headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+
+            print(f"    Transient API error ({type(e).__name__}), retrying in {delay:.1f}s...", flush=True)
+            time.sleep(delay)
+
+
+def _parse_polish_response(response_text, prompt="", context=None):
+    """
+    Parse a polishing response, taking the fast path when possible.
+
+    Well-formed responses (optionally fenced in markdown) are parsed directly
+    with orjson; anything else falls through to parse_json_response and the
+    full ResponseFixer strategy chain.
+    """
+    if _orjson is not None and response_text:
+        stripped = _FENCE.sub('', response_text).strip()
+        try:
+            result = _orjson.loads(stripped)
+        except _orjson.JSONDecodeError:
+            pass
+        else:
+            if isinstance(result, (dict, list)):
+                return result
+
+    return parse_json_response(response_text, prompt=prompt, context=context)
+
+
+class _LLMSettings(NamedTuple):
+    """Flattened LLM/polishing knobs, resolved from config once per run"""
+    batch_size: int
+    max_tokens: int
+    temperature: float
+    max_input_tokens: int
+    rpm: int
+    tpm: int
+    max_concurrency: int
+    batch_api_threshold: int
+
+
+def _resolve_llm_config(config, text_polishing_config):
+    """Walk the nested config dicts once and return the flat settings tuple
+    the batch loop reads, so hot paths never repeat the dict.get ladder"""
+    llm_config = config.get("llm", {})
+    return _LLMSettings(
+        batch_size=text_polishing_config.get("batch_size", 10),
+        max_tokens=llm_config.get("max_tokens", 1024),
+        temperature=llm_config.get("temperature", 0.0),
+        max_input_tokens=text_polishing_config.get("max_input_tokens", 3000),
+        rpm=llm_config.get("rpm", 40),
+        tpm=llm_config.get("tpm", 16000),
+        max_concurrency=text_polishing_config.get("max_concurrency", 8),
+        batch_api_threshold=text_polishing_config.get("batch_api_threshold", 100),
+    )
+
+
+def _make_response_cache(text_polishing_config):
+    """Build the deterministic response cache if enabled in config"""
+    cache_config = text_polishing_config.get("cache", {})
+    if not cache_config.get("enable", False):
+        return None
+    return ResponseCache(cache_config.get("dir", ".polish_cache"))
+
+
+def _generate_cached(llm_provider, prompt, max_tokens, temperature, cache, limiter=None):
+    """Generate through the provider, consulting the response cache first and
+    reserving rate-limit budget before going over the network"""
+    key = cache_key(getattr(llm_provider, "model", ""), prompt, temperature) if cache else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if limiter is not None:
+        limiter.acquire(tokens=estimate_tokens(prompt, max_tokens))
+
+    # Anthropic models return structured output through a forced tool call and
+    # take the constant instructions as a cached system block; other providers
+    # keep the single-message prompt-JSON contract
+    generate_kwargs = {}
+    send_prompt = prompt
+    if isinstance(llm_provider, AnthropicProvider):
+        generate_kwargs = {
+            "tools": [POLISH_TOOL],
+            "tool_choice": _POLISH_TOOL_CHOICE,
+            "system": _ANTHROPIC_SYSTEM,
+        }
+        if prompt.startswith(_SYSTEM_PROMPT):
+            send_prompt = prompt[len(_SYSTEM_PROMPT) + 2:]
+
+    response_text = _with_retry(
+        lambda: llm_provider.generate(send_prompt, max_tokens=max_tokens, temperature=temperature,
+                                      **generate_kwargs),
+        limiter=limiter
+    )
+
+    if key is not None:
+        cache.set(key, response_text)
+    return response_text
+
+
+# Constant instruction block, shared by every batch. Sending it as a system
+# block with cache_control lets Anthropic's prompt caching serve the repeated
+# prefix at a discount; only the numbered segment list varies per request.
+_SYSTEM_PROMPT = """これは音声認識によって生成された日本語字幕です。実際に話された内容を書き起こしたものなので、話者が実際に言った通りに字幕を整形してください。
+
+重要な注意事項:
+- これは音声の書き起こしです。勝手に言葉を追加したり、話者が言っていないことを補完しないでください
+- 話者が実際に話した内容を忠実に反映してください
+- 口語表現や砕けた言い方はそのまま保持してください（話し言葉として自然です）
+
+以下の最小限の修正のみを行ってください:
+1. 明らかな音声認識エラーの修正（「わたし」→「私」など、同音異義語の誤変換のみ）
+2. 文末に適切な句読点を追加（。？！など）
+3. 不自然な区切りや改行を修正
+4. 助詞の誤りを修正（「は」と「わ」、「を」と「お」など）
+
+絶対にしないこと:
+- 話者が言っていない言葉を追加しない
+- 口語を書き言葉に変更しない（「〜だよ」「〜じゃん」「〜って感じ」などはそのまま）
+- 言い直しや言い淀みを削除しない（それも話者の発言の一部です）
+
+JSON形式で返してください。例: {"polished": ["整形後1", "整形後2", "整形後3"]}
+JSONのみ出力してください。説明や理由は不要です。"""
+
+_ANTHROPIC_SYSTEM = [{"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+
+def _build_user_prompt(texts):
+    """Build the per-batch portion of the prompt: the numbered segment list"""
+    numbered_texts = "\n".join([f"{idx+1}. {text}" for idx, text in enumerate(texts)])
+    return f"元のテキスト（音声認識結果）:\n{numbered_texts}"
+
+
+def _build_polish_prompt(texts):
+    """Full single-message prompt for providers without system-block support
+    (also the cache key for both provider styles)"""
+    return _SYSTEM_PROMPT + "\n\n" + _build_user_prompt(texts)
+
+
+def _estimate_input_tokens(text):
+    """Rough prompt cost of one segment: ~2 chars per token for Japanese"""
+    return len(text) // 2 + 1
+
+
+def _pack_by_tokens(segments, max_input_tokens, max_per_request):
+    """
+    Greedily pack segments into batches bounded by a prompt-token budget.
+
+    A fixed per-batch count wastes headroom on short segments and risks
+    overflowing the response budget on long ones; packing by estimated tokens
+    keeps every request close to full. max_per_request (the configured
+    batch_size) stays as an upper bound on items per batch.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for seg in segments:
+        text = seg[2] if len(seg) >= 3 else ""
+        cost = _estimate_input_tokens(text)
+        if current and (len(current) >= max_per_request
+                        or current_tokens + cost > max_input_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(seg)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _load_checkpoint(checkpoint_path):
+    """
+    Load polished texts from a JSONL checkpoint, keyed by original segment
+    index. Missing files and corrupt lines (e.g. a partial write from an
+    interrupted run) are silently skipped.
+    """
+    done = {}
+    try:
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    done[int(entry["i"])] = entry["t"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        return {}
+    return done
+
+
+def _append_checkpoint(checkpoint_path, entries):
+    """Append (index, polished_text) pairs to the JSONL checkpoint (best-effort)"""
+    try:
+        with open(checkpoint_path, "a", encoding="utf-8") as f:
+            for index, text in entries:
+                f.write(json.dumps({"i": index, "t": text}, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def _already_terminated(text):
+    """True when text already ends in a sentence terminator"""
+    return text.rstrip()[-1:] in "。．.！？!?"
+
+
+def _merge_polished(segments, polish_indices, polished):
+    """Splice polished segments back into the full list in original order"""
+    merged = list(segments)
+    for pos, idx in enumerate(polish_indices):
+        if pos < len(polished):
+            merged[idx] = polished[pos]
+    return merged
+
+
+def _rebuild_segment(seg, polished_text):
+    """Return seg with its text replaced, preserving timing and words"""
+    if len(seg) == 4:
+        return (seg[0], seg[1], polished_text, seg[3])
+    elif len(seg) == 3:
+        return (seg[0], seg[1], polished_text)
+    return seg
+
+
+def _retry_bisect(batch, llm_provider, max_tokens, temperature, cache, batch_num, total_segments, original_error, limiter=None):
+    """
+    Recover from a failed batch by recursively halving it.
+
+    Retries the whole batch once (transient failures often pass on retry),
+    then splits in half on failure. A single poisoned segment is isolated in
+    O(log n) calls instead of one call per segment; a failing singleton keeps
+    its original text.
+
+    Returns:
+        (recovered_segments, success_count)
+    """
+    texts = [seg[2] if len(seg) >= 3 else "" for seg in batch]
+
+    try:
+        prompt = _build_polish_prompt(texts)
+        response_text = _generate_cached(llm_provider, prompt, max_tokens, temperature, cache, limiter)
+
+        context = {
+            "stage": "text_polishing",
+            "batch_num": batch_num,
+            "batch_size": len(batch),
+            "total_segments": total_segments,
+            "processing_mode": "bisect_retry",
+            "original_error": original_error
+        }
+        result = _parse_polish_response(response_text, prompt=prompt, context=context)
+
+        if isinstance(result, list):
+            polished_texts = result
+        elif isinstance(result, dict) and isinstance(result.get("polished"), list):
+            polished_texts = result["polished"]
+        else:
+            polished_texts = texts
+
+        recovered = []
+        for j, seg in enumerate(batch):
+            if j < len(polished_texts) and len(seg) >= 3:
+                recovered.append(_rebuild_segment(seg, polished_texts[j]))
+            else:
+                recovered.append(seg)
+        return recovered, len(batch)
+
+    except Exception as e:
+        if len(batch) == 1:
+            error_details = f"{type(e).__name__}: {str(e)[:100]}"
+            print(f"    WARNING: Segment failed after bisect: {error_details}", flush=True)
+            print(f"             Text: {texts[0][:80]}...", flush=True)
+            return list(batch), 0
+
+        mid = len(batch) // 2
+        left, left_count = _retry_bisect(batch[:mid], llm_provider, max_tokens, temperature,
+                                         cache, batch_num, total_segments, original_error, limiter)
+        right, right_count = _retry_bisect(batch[mid:], llm_provider, max_tokens, temperature,
+                                           cache, batch_num, total_segments, original_error, limiter)
+        return left + right, left_count + right_count
+
+
+def _polish_with_batch_api(segments, llm_provider, config):
+    """
+    Polish all segments through the Anthropic Message Batches API.
+
+    Submits one batch job with a per-segment request (custom_id "seg-<i>"),
+    polls until processing ends, and reassembles results by custom_id. One
+    submission plus polling replaces N synchronous round trips, and batch
+    requests are billed at a discount.
+
+    Raises on submission/polling failure so the caller can fall back to the
+    standard batched path. Per-segment failures keep the original text.
+    """
+    llm_config = config.get("llm", {})
+    client = llm_provider.client
+    max_tokens = llm_config.get("max_tokens", 1024) or 4096
+    temperature = llm_config.get("temperature", 0.0)
+
+    requests = []
+    for i, seg in enumerate(segments):
+        text = seg[2] if len(seg) >= 3 else ""
+        requests.append({
+            "custom_id": f"seg-{i}",
+            "params": {
+                "model": llm_provider.model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "messages": [{"role": "user", "content": _build_polish_prompt([text])}],
+            },
+        })
+
+    print(f"  - Submitting {len(segments)} segments as one Message Batches job")
+    batch = client.messages.batches.create(requests=requests)
+
+    # Poll with exponential backoff until the batch finishes
+    poll_delay = 2.0
+    max_wait = config.get("text_polishing", {}).get("batch_api_timeout", 3600)
+    waited = 0.0
+    while batch.processing_status != "ended":
+        if waited >= max_wait:
+            raise TimeoutError(f"Batch {batch.id} did not finish within {max_wait}s")
+        time.sleep(poll_delay)
+        waited += poll_delay
+        poll_delay = min(poll_delay * 2, 60.0)
+        batch = client.messages.batches.retrieve(batch.id)
+
+    # Reassemble results by custom_id; failed entries keep the original text
+    polished_by_index = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type != "succeeded":
+            continue
+        index = int(entry.custom_id.split("-", 1)[1])
+        response_text = entry.result.message.content[0].text.strip()
+        try:
+            result = _parse_polish_response(response_text, context={
+                "stage": "text_polishing",
+                "processing_mode": "batch_api",
+                "custom_id": entry.custom_id,
+            })
+        except Exception:
+            continue
+        if isinstance(result, dict):
+            result = result.get("polished")
+        if isinstance(result, list) and result:
+            polished_by_index[index] = result[0]
+
+    polished_segments = []
+    for i, seg in enumerate(segments):
+        if i in polished_by_index and len(seg) >= 3:
+            polished_segments.append((*seg[:2], polished_by_index[i], *seg[3:]))
+        else:
+            polished_segments.append(seg)
+
+    print(f"  - Completed: {len(polished_by_index)}/{len(segments)} segments polished via batch API")
+    return polished_segments
 
 
 def polish_segments_with_llm(segments, config):
     """Use LLM to polish subtitle text for better formatting"""
+    return list(_iter_polished(segments, config))
+
+
+def _iter_polished(segments, config):
+    """
+    Lazily polish segments, yielding them in original order.
+
+    On the sequential path each batch is requested only when the consumer
+    pulls its segments, so at most one batch's response strings and parsed
+    JSON are live at a time. The concurrent multi-batch path trades that
+    bound for latency: it prefetches every batch's response text up front
+    (parsed JSON is still one batch at a time) before streaming begins.
+    polish_segments_with_llm wraps this with list() for the eager interface.
+    """
     text_polishing_config = config.get("text_polishing", {})
 
     if not text_polishing_config.get("enable", False):
-        return segments
+        yield from segments
+        return
 
     # Create LLM provider (with stage-specific config if available)
     llm_provider = create_llm_provider(config, stage_name="text_polishing")
 
     if not llm_provider:
         # LLM provider not available, skip polishing
-        return segments
+        yield from segments
+        return
+
+    # Pre-filter segments that cannot benefit from polishing (empty,
+    # whitespace-only, or already ending in a sentence terminator): fewer
+    # items per batch means fewer tokens and fewer API calls
+    all_segments = segments
+    polish_indices = [
+        idx for idx, seg in enumerate(segments)
+        if len(seg) >= 3 and seg[2].strip() and not _already_terminated(seg[2])
+    ]
+
+    if not polish_indices:
+        yield from segments
+        return
+
+    if len(polish_indices) < len(segments):
+        print(f"  - Skipping {len(segments) - len(polish_indices)} segments that need no polishing")
+
+    # Resume from a previous interrupted run: segments already present in the
+    # checkpoint take their polished text directly and skip the API entirely
+    # (opt-in via text_polishing.checkpoint, a JSONL path)
+    checkpoint_path = text_polishing_config.get("checkpoint")
+    if checkpoint_path:
+        done = _load_checkpoint(checkpoint_path)
+        resumed = [idx for idx in polish_indices if idx in done]
+        if resumed:
+            print(f"  - Resuming: {len(resumed)} segments already polished in checkpoint")
+            all_segments = _merge_polished(
+                all_segments, resumed,
+                [_rebuild_segment(all_segments[idx], done[idx]) for idx in resumed]
+            )
+            polish_indices = [idx for idx in polish_indices if idx not in done]
+            if not polish_indices:
+                yield from all_segments
+                return
+
+    segments = [all_segments[idx] for idx in polish_indices]
+
+    # Resolve the LLM/polishing knobs once; the batch loop below reads only
+    # this flat tuple
+    settings = _resolve_llm_config(config, text_polishing_config)
+
+    # For large jobs, the Message Batches API collapses N round trips into one
+    # submission + polling (opt-in, Anthropic only)
+    if (text_polishing_config.get("use_batch_api", False)
+            and len(segments) >= settings.batch_api_threshold
+            and isinstance(llm_provider, AnthropicProvider)):
+        try:
+            yield from _merge_polished(all_segments, polish_indices,
+                                       _polish_with_batch_api(segments, llm_provider, config))
+            return
+        except Exception as e:
+            print(f"  - Warning: Batch API polishing failed ({type(e).__name__}: {e}), falling back to standard batching")
+
+    # Position in all_segments up to which results have been yielded
+    next_original = 0
 
     try:
-        # Get LLM config for parameters
-        llm_config = config.get("llm", {})
-
         # Process in batches to reduce API calls
         # batch_size <= 1 means process one-by-one (useful for Ollama and other local providers)
-        batch_size = text_polishing_config.get("batch_size", 10)
-        polished_segments = []
+        batch_size = settings.batch_size
+        completed = 0
         total_segments = len(segments)
 
-        # If batch_size is 0 or 1, process one-by-one
+        # If batch_size is 0 or 1, process one-by-one; otherwise pack segments
+        # into batches up to the prompt-token budget, with batch_size as the
+        # per-batch item ceiling
         if batch_size <= 1:
             batch_size = 1
+            batches = [[seg] for seg in segments]
             print(f"  - Processing {total_segments} segments one-by-one (batch processing disabled)")
         else:
-            total_batches = (len(segments) + batch_size - 1) // batch_size
-            print(f"  - Processing {total_segments} segments in {total_batches} batches (batch size: {batch_size})")
+            batches = _pack_by_tokens(segments, settings.max_input_tokens, batch_size)
+            print(f"  - Processing {total_segments} segments in {len(batches)} batches (batch size: {batch_size})")
+
+        # Redraw the bar only when the whole percent moves: each draw takes the
+        # stdout lock and forces a flush syscall, which adds up when hundreds
+        # of single-segment batches complete in quick succession
+        last_percent = [-1]
 
         def _print_progress(completed, total):
-            """Print progress bar"""
-            percent = 100 * (completed / float(total))
+            """Print progress bar (throttled to whole-percent changes)"""
+            percent = 100 * completed // total
+            if percent == last_percent[0] and completed != total:
+                return
+            last_percent[0] = percent
             filled = int(40 * completed // total)
             bar = '█' * filled + '░' * (40 - filled)
-            print(f'\r    Progress: |{bar}| {completed}/{total} ({percent:.0f}%)', end='', flush=True)
+            print(f'\r    Progress: |{bar}| {completed}/{total} ({percent}%)', end='', flush=True)
             if completed == total:
                 print()  # New line on completion
 
-        for i in range(0, len(segments), batch_size):
-            batch = segments[i:i + batch_size]
-            batch_num = i // batch_size + 1
+        # Precompute batch texts so multi-batch jobs can be dispatched
+        # concurrently
+        batch_texts = [
+            [seg[2] if len(seg) >= 3 else "" for seg in batch]
+            for batch in batches
+        ]
+        max_tokens = settings.max_tokens
+        temperature = settings.temperature
+
+        # Deterministic (temperature=0) responses can be served from cache,
+        # skipping the API round trip on re-runs of the same transcript
+        cache = _make_response_cache(text_polishing_config)
+        model = getattr(llm_provider, "model", "")
+
+        # Keep this run inside the API's RPM/TPM ceiling instead of stampeding
+        # it and churning on 429s (rpm/tpm of 0 disables limiting)
+        limiter = RateLimiter(rpm=settings.rpm, tpm=settings.tpm) if settings.rpm and settings.tpm else None
+
+        # When the provider supports it, fire all batch requests concurrently
+        # (bounded by max_concurrency) instead of waiting one RTT per batch.
+        # Entries are response texts, or the per-batch exception so the normal
+        # fallback path below still applies.
+        prefetched_responses = None
+        if batch_size > 1 and len(batches) > 1 and hasattr(llm_provider, "generate_many"):
+            prompts = [_build_polish_prompt(texts) for texts in batch_texts]
+
+            # Resolve cache hits first so only misses go over the network
+            responses = [None] * len(prompts)
+            if cache is not None:
+                for idx, batch_prompt in enumerate(prompts):
+                    key = cache_key(model, batch_prompt, temperature)
+                    if key is not None:
+                        responses[idx] = cache.get(key)
+
+            miss_indices = [idx for idx, resp in enumerate(responses) if resp is None]
+            if not miss_indices:
+                prefetched_responses = responses
+            else:
+                max_concurrency = settings.max_concurrency
+                print(f"  - Dispatching {len(miss_indices)} batches with up to {max_concurrency} concurrent requests")
+
+                # Anthropic requests carry the same contract as the
+                # sequential path: constant instructions go in the
+                # prompt-cached system block, structured output comes back
+                # through the forced tool call, and only the varying segment
+                # list is sent as the user message. Cache keys stay on the
+                # full prompt for both provider styles.
+                generate_kwargs = {}
+                send_prompts = prompts
+                if isinstance(llm_provider, AnthropicProvider):
+                    generate_kwargs = {
+                        "tools": [POLISH_TOOL],
+                        "tool_choice": _POLISH_TOOL_CHOICE,
+                        "system": _ANTHROPIC_SYSTEM,
+                    }
+                    send_prompts = [
+                        p[len(_SYSTEM_PROMPT) + 2:] if p.startswith(_SYSTEM_PROMPT) else p
+                        for p in prompts
+                    ]
+
+                try:
+                    # Dispatch in limiter-paced waves of max_concurrency:
+                    # budget is reserved right before each wave goes out, so
+                    # requests pace against the limiter instead of stalling
+                    # until the whole run's budget has accumulated and then
+                    # bursting everything at once
+                    fetched = []
+                    for start in range(0, len(miss_indices), max_concurrency):
+                        wave = miss_indices[start:start + max_concurrency]
+                        if limiter is not None:
+                            for idx in wave:
+                                limiter.acquire(tokens=estimate_tokens(prompts[idx], max_tokens))
+                        fetched.extend(llm_provider.generate_many(
+                            [send_prompts[idx] for idx in wave],
+                            max_tokens=max_tokens, temperature=temperature,
+                            max_concurrency=max_concurrency, **generate_kwargs
+                        ))
+                        # A 429 in this wave drains the buckets, backing the
+                        # next wave off the same way _with_retry does
+                        if limiter is not None and any(
+                                getattr(resp, "status_code", None) == 429
+                                for resp in fetched[start:]):
+                            limiter.penalize()
+                except Exception as e:
+                    print(f"  - Warning: Concurrent dispatch failed ({type(e).__name__}: {e}), processing sequentially")
+                else:
+                    for idx, response_text in zip(miss_indices, fetched):
+                        responses[idx] = response_text
+                        if cache is not None and isinstance(response_text, str):
+                            key = cache_key(model, prompts[idx], temperature)
+                            if key is not None:
+                                cache.set(key, response_text)
+                    prefetched_responses = responses
+
+        for batch_index, batch in enumerate(batches):
+            batch_num = batch_index + 1
+            batch_result = []
 
             # Track batch status for summary
             batch_success = False
             batch_error_msg = None
             one_by_one_success = 0
 
-            # Extract texts for polishing
-            texts = []
-            for seg in batch:
-                if len(seg) >= 3:
-                    texts.append(seg[2])  # text is 3rd element
-                else:
-                    texts.append("")
+            texts = batch_texts[batch_index]
 
             # Build prompt
-            numbered_texts = "\n".join([f"{idx+1}. {text}" for idx, text in enumerate(texts)])
-
-            prompt = f"""これは音声認識によって生成された日本語字幕です。実際に話された内容を書き起こしたものなので、話者が実際に言った通りに字幕を整形してください。
-
-重要な注意事項:
-- これは音声の書き起こしです。勝手に言葉を追加したり、話者が言っていないことを補完しないでください
-- 話者が実際に話した内容を忠実に反映してください
-- 口語表現や砕けた言い方はそのまま保持してください（話し言葉として自然です）
-
-以下の最小限の修正のみを行ってください:
-1. 明らかな音声認識エラーの修正（「わたし」→「私」など、同音異義語の誤変換のみ）
-2. 文末に適切な句読点を追加（。？！など）
-3. 不自然な区切りや改行を修正
-4. 助詞の誤りを修正（「は」と「わ」、「を」と「お」など）
-
-絶対にしないこと:
-- 話者が言っていない言葉を追加しない
-- 口語を書き言葉に変更しない（「〜だよ」「〜じゃん」「〜って感じ」などはそのまま）
-- 言い直しや言い淀みを削除しない（それも話者の発言の一部です）
-
-元のテキスト（音声認識結果）:
-{numbered_texts}
-
-JSON形式で返してください。例: {{"polished": ["整形後1", "整形後2", "整形後3"]}}
-JSONのみ出力してください。説明や理由は不要です。"""
+            prompt = _build_polish_prompt(texts)
 
             try:
-                # Generate response using provider
-                max_tokens = llm_config.get("max_tokens", 1024)
-                temperature = llm_config.get("temperature", 0.0)
-                response_text = llm_provider.generate(prompt, max_tokens=max_tokens, temperature=temperature)
+                # Use the prefetched response when available, otherwise issue
+                # the request now
+                if prefetched_responses is not None:
+                    response_text = prefetched_responses[batch_index]
+                    if isinstance(response_text, Exception):
+                        raise response_text
+                else:
+                    response_text = _generate_cached(llm_provider, prompt, max_tokens, temperature, cache, limiter)
 
                 # Parse JSON response with context for error logging
                 context = {
@@ -103,7 +693,7 @@ JSONのみ出力してください。説明や理由は不要です。"""
                     "total_segments": total_segments,
                     "processing_mode": "batch"
                 }
-                result = parse_json_response(response_text, prompt=prompt, context=context)
+                result = _parse_polish_response(response_text, prompt=prompt, context=context)
 
                 # Handle both dict {"polished": [...]} and direct list [...]
                 if isinstance(result, list):
@@ -116,117 +706,73 @@ JSONのみ出力してください。説明や理由は不要です。"""
                 else:
                     polished_texts = texts
 
-                # Replace texts in segments
-                for j, polished_text in enumerate(polished_texts):
-                    if j < len(batch):
-                        seg = batch[j]
-                        if len(seg) == 4:
-                            # Preserve timing and words
-                            polished_segments.append((seg[0], seg[1], polished_text, seg[3]))
-                        elif len(seg) == 3:
-                            polished_segments.append((seg[0], seg[1], polished_text))
-                        else:
-                            polished_segments.append(seg)
+                # Replace texts in segments. zip_longest pads a short polished
+                # array with the original segment, so batch_result always has
+                # exactly len(batch) entries - the completed/polish_indices
+                # mapping below relies on that invariant
+                for seg, polished_text in zip_longest(
+                        batch, polished_texts[:len(batch)], fillvalue=None):
+                    if polished_text is None:
+                        batch_result.append(seg)
+                    elif len(seg) == 4:
+                        # Preserve timing and words
+                        batch_result.append((seg[0], seg[1], polished_text, seg[3]))
+                    elif len(seg) == 3:
+                        batch_result.append((seg[0], seg[1], polished_text))
+                    else:
+                        batch_result.append(seg)
 
                 batch_success = True
 
             except Exception as e:
-                # Batch failed, try individually
+                # Batch failed: recover by recursively halving the batch so a
+                # single poisoned segment costs O(log n) calls, not n
                 batch_error_msg = f"{type(e).__name__}: {str(e)[:100]}"
                 print(f"\r    Batch {batch_num} failed ({batch_error_msg})", flush=True)
-                print(f"    Retrying {len(batch)} segments individually...", flush=True)
-
-                # Try polishing one-by-one
-                for j, seg in enumerate(batch):
-                    if len(seg) >= 3:
-                        text = seg[2]
-                        try:
-                            prompt = f"""これは音声認識によって生成された日本語字幕です。実際に話された内容を書き起こしたものなので、話者が実際に言った通りに字幕を整形してください。
-
-重要な注意事項:
-- これは音声の書き起こしです。勝手に言葉を追加したり、話者が言っていないことを補完しないでください
-- 話者が実際に話した内容を忠実に反映してください
-- 口語表現や砕けた言い方はそのまま保持してください（話し言葉として自然です）
-
-以下の最小限の修正のみを行ってください:
-1. 明らかな音声認識エラーの修正（「わたし」→「私」など、同音異義語の誤変換のみ）
-2. 文末に適切な句読点を追加（。？！など）
-3. 不自然な区切りや改行を修正
-4. 助詞の誤りを修正（「は」と「わ」、「を」と「お」など）
-
-絶対にしないこと:
-- 話者が言っていない言葉を追加しない
-- 口語を書き言葉に変更しない（「〜だよ」「〜じゃん」「〜って感じ」などはそのまま）
-- 言い直しや言い淀みを削除しない（それも話者の発言の一部です）
-
-元のテキスト（音声認識結果）:
-1. {text}
-
-JSON形式で返してください。例: {{"polished": ["整形後1"]}}
-JSONのみ出力してください。説明や理由は不要です。"""
-
-                            # Generate response using provider
-                            max_tokens = llm_config.get("max_tokens", 1024)
-                            temperature = llm_config.get("temperature", 0.0)
-                            response_text = llm_provider.generate(prompt, max_tokens=max_tokens, temperature=temperature)
-
-                            # Parse JSON response with context for error logging
-                            context = {
-                                "stage": "text_polishing",
-                                "batch_num": batch_num,
-                                "segment_num": j + 1,
-                                "total_in_batch": len(batch),
-                                "processing_mode": "individual_retry",
-                                "original_error": batch_error_msg,
-                                "segment_text": text[:100]  # First 100 chars for reference
-                            }
-                            result = parse_json_response(response_text, prompt=prompt, context=context)
-
-                            # Handle both dict {"polished": [...]} and direct list [...]
-                            if isinstance(result, list):
-                                polished_text = result[0] if result else text
-                            elif isinstance(result, dict):
-                                polished_list = result.get("polished", [text])
-                                # Validate type - if not a list, use original text
-                                if isinstance(polished_list, list):
-                                    polished_text = polished_list[0] if polished_list else text
-                                else:
-                                    polished_text = text
-                            else:
-                                polished_text = text
-
-                            # Add polished segment
-                            if len(seg) == 4:
-                                polished_segments.append((seg[0], seg[1], polished_text, seg[3]))
-                            elif len(seg) == 3:
-                                polished_segments.append((seg[0], seg[1], polished_text))
-                            else:
-                                polished_segments.append(seg)
-                            one_by_one_success += 1
-
-                        except Exception as e2:
-                            # Keep original segment if one-by-one also fails
-                            error_details = f"{type(e2).__name__}: {str(e2)[:100]}"
-                            print(f"    WARNING: Segment {j+1}/{len(batch)} failed: {error_details}", flush=True)
-                            print(f"             Text: {text[:80]}...", flush=True)
-                            polished_segments.append(seg)
-                    else:
-                        # Keep segments without text unchanged
-                        polished_segments.append(seg)
+                print(f"    Retrying {len(batch)} segments with bisecting split...", flush=True)
+
+                recovered, one_by_one_success = _retry_bisect(
+                    batch, llm_provider, max_tokens, temperature, cache,
+                    batch_num, total_segments, batch_error_msg, limiter
+                )
+                batch_result.extend(recovered)
+
+            # Record successful batches so an interrupted run can resume
+            # without re-polishing them
+            if batch_success and checkpoint_path:
+                _append_checkpoint(checkpoint_path, [
+                    (polish_indices[completed + j], seg[2])
+                    for j, seg in enumerate(batch_result)
+                    if len(seg) >= 3
+                ])
+
+            # Stream this batch's results, interleaved with the untouched
+            # segments that precede them, in original order
+            for j, polished_seg in enumerate(batch_result):
+                orig_idx = polish_indices[completed + j]
+                while next_original < orig_idx:
+                    yield all_segments[next_original]
+                    next_original += 1
+                yield polished_seg
+                next_original = orig_idx + 1
+
+            completed += len(batch_result)
 
             # Update progress bar once per batch (after both success and failure paths)
-            _print_progress(len(polished_segments), total_segments)
+            _print_progress(completed, total_segments)
 
             # Print batch summary if there were failures
             if not batch_success:
                 if one_by_one_success > 0:
-                    print(f"    Batch {batch_num}: {one_by_one_success}/{len(batch)} segments succeeded in individual retry")
+                    print(f"    Batch {batch_num}: {one_by_one_success}/{len(batch)} segments succeeded in bisect retry")
                 else:
                     print(f"    Batch {batch_num}: All {len(batch)} segments failed (using original text)")
 
-        print(f"  - Completed: {len(polished_segments)}/{total_segments} segments polished")
-        return polished_segments
+        print(f"  - Completed: {completed}/{total_segments} segments polished")
 
     except Exception as e:
         print(f"  - Warning: Polishing failed: {e}")
-        return segments
+
+    # Everything not yet yielded (trailing passthrough segments, plus anything
+    # a failed run left unpolished) keeps its original text
+    yield from all_segments[next_original:]
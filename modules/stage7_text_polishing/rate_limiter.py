@@ -0,0 +1,63 @@
+"""Token-bucket rate limiting for LLM API calls"""
+
+import time
+
+
+def estimate_tokens(prompt, max_tokens):
+    """Rough request cost estimate: ~3 chars per token for Japanese prompts,
+    plus the full response budget"""
+    return len(prompt) // 3 + max_tokens
+
+
+class RateLimiter:
+    """
+    Dual token-bucket limiter covering requests/minute and tokens/minute.
+
+    Both buckets start full and refill continuously on a monotonic clock.
+    acquire() blocks until one request plus the estimated token cost fit,
+    which keeps throughput at the configured ceiling instead of blowing past
+    it and churning on 429 responses.
+
+    The clock and sleep functions are injectable for testing.
+    """
+
+    def __init__(self, rpm=40, tpm=16000, clock=time.monotonic, sleep=time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = clock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens=0):
+        """Block until one request and `tokens` estimated tokens fit the budget"""
+        # A single request estimated above the whole per-minute budget could
+        # never fit a bucket capped at tpm, so acquire() would spin forever.
+        # Clamp to the bucket capacity: the call waits for a full bucket and
+        # the provider is left to accept or reject the oversized request.
+        tokens = min(tokens, self.tpm)
+        while True:
+            self._refill()
+            if self._requests >= 1.0 and self._tokens >= tokens:
+                self._requests -= 1.0
+                self._tokens -= tokens
+                return
+
+            # Sleep just long enough for the tighter bucket to refill
+            request_wait = max(0.0, (1.0 - self._requests) * 60.0 / self.rpm)
+            token_wait = max(0.0, (tokens - self._tokens) * 60.0 / self.tpm) if tokens else 0.0
+            self._sleep(max(request_wait, token_wait, 0.01))
+
+    def penalize(self):
+        """Empty both buckets after a 429, forcing a full refill wait"""
+        self._refill()
+        self._requests = 0.0
+        self._tokens = 0.0
@@ -6,6 +6,11 @@ modifications from timing re-validation are properly filtered for hallucinations
 
 This stage applies stammer filter and vocalization replacements as the last
 cleanup step before VTT generation.
+
+Segments deliberately stay as (start, end, text, words) tuples rather than
+parallel start/end/text arrays: the filters are text-bound, every stage and
+test shares the tuple contract, and the numeric scans that do benefit from
+vectorization (cluster windows) already run through NumPy in stammer_filter.
 """
 
 from modules.stage8_final_cleanup.stammer_filter import (
@@ -35,18 +40,24 @@ def apply_final_cleanup(segments, config):
         print("  - Final cleanup disabled")
         return segments
 
+    stammer_config = final_cleanup_config.get("stammer_filter", {})
+    enable_stammer = stammer_config.get("enable", True)
+    global_word_config = final_cleanup_config.get("global_word_filter", {})
+    enable_global_words = global_word_config.get("enable", False)
+
+    # Nothing to do when every sub-filter is off, even with the stage enabled
+    if not enable_stammer and not enable_global_words:
+        print("  - Final cleanup: all filters disabled")
+        return segments
+
     print("  - Applying final cleanup filters...")
 
     # Apply stammer filter (condensing repetitions, vocalization replacement)
-    stammer_config = final_cleanup_config.get("stammer_filter", {})
-    enable_stammer = stammer_config.get("enable", True)
     if enable_stammer:
         print("    - Stammer filter (condensing repetitions)")
         segments = filter_repetitive_stammer_segments(segments, config)
 
     # Apply global word filter (detect and replace globally repeated words)
-    global_word_config = final_cleanup_config.get("global_word_filter", {})
-    enable_global_words = global_word_config.get("enable", False)
     if enable_global_words:
         hallucination_words = detect_global_hallucination_words(segments, config)
         if hallucination_words:
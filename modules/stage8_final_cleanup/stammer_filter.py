@@ -1,56 +1,57 @@
 """Hallucination detection and filtering"""
 
+import functools
 import re
 from collections import Counter, defaultdict
 
+import numpy as np
+
+# Punctuation/whitespace stripped before frequency analysis, precomputed so
+# the hot path is a single C-level translate pass per segment
+_PUNCT_TABLE = str.maketrans('', '', '、。？！…　 \t\n\r\f\v')
+_WORD_SPLIT = re.compile(r'[、。？！\s…]+')
+# Same character repeated 20+ times (はっ x200 style hallucinations), compiled
+# once so the per-segment scan is a single C-level finditer
+_CHAR_REPEAT = re.compile(r'(.)\1{19,}')
+# Comma/whitespace tokenizer used when checking whether a segment is a single
+# repeated word ("僕、僕、僕")
+_COMMA_SPLIT = re.compile(r'[、\s]+')
+
 
 def is_only_repetitive_stammer(text):
     """Check if text is ONLY repetitive stammering or repeated word patterns (Whisper hallucination)"""
-    import re
-
     text = text.strip()
     if len(text) == 0:
         return True
 
     # Remove all punctuation to analyze content
-    clean = re.sub(r'[、。？！\s…]', '', text)
+    clean = text.translate(_PUNCT_TABLE)
 
     if len(clean) == 0:
         return True
 
     # Method 1: Check if it's just 1-2 unique characters repeated many times
-    unique_chars = len(set(clean))
-    if unique_chars <= 2 and len(clean) >= 8:
+    if len(clean) >= 8 and len(set(clean)) <= 2:
         return True
 
     # Method 1b: Check if a single character dominates the text (e.g., "くそ…うううううう...")
-    # Count character frequencies
-    from collections import Counter
-    char_counts = Counter(clean)
-    if char_counts:
-        most_common_char, most_common_count = char_counts.most_common(1)[0]
-        # If one character represents 80%+ and appears 50+ times, it's hallucination
-        if most_common_count >= 50 and (most_common_count / len(clean)) >= 0.8:
-            return True
+    # Counter runs one linear pass in C instead of a Python char loop
+    most_common_char, most_common_count = Counter(clean).most_common(1)[0]
+    # If one character represents 80%+ and appears 50+ times, it's hallucination
+    if most_common_count >= 50 and (most_common_count / len(clean)) >= 0.8:
+        return True
 
     # Method 2: Check for repetitive word/phrase patterns
     # Split by common punctuation
-    words = re.split(r'[、。？！\s…]+', text)
-    words = [w for w in words if w]  # Remove empty strings
+    words = [w for w in _WORD_SPLIT.split(text) if w]
 
     if len(words) < 3:
         return False  # Too short to be repetitive pattern
 
-    # Count word frequencies
-    word_counts = Counter(words)
-
     # If the most common word appears 5+ times and represents 80%+ of all words
-    if word_counts:
-        most_common_word, most_common_count = word_counts.most_common(1)[0]
-        total_words = len(words)
-
-        if most_common_count >= 5 and (most_common_count / total_words) >= 0.8:
-            return True
+    most_common_word, most_common_count = Counter(words).most_common(1)[0]
+    if most_common_count >= 5 and (most_common_count / len(words)) >= 0.8:
+        return True
 
     return False
 
@@ -63,68 +64,80 @@ def detect_global_hallucination_words(sub_segments, config):
     min_occurrences = global_word_config.get("min_occurrences", 12)
     cluster_time_window = cluster_config.get("time_window_seconds", 60)
     cluster_min = cluster_config.get("min_occurrences", 6)
-    from collections import Counter, defaultdict
-    import re
 
-    # Track occurrences and timestamps for each word
+    enable_global = global_word_config.get("enable", False)
+    enable_cluster = cluster_config.get("enable", False)
+    if not enable_global and not enable_cluster:
+        return set()
+
+    def candidate_word(text):
+        """The segment's single short repeated word, or None if it's real dialogue"""
+        # Remove commas and count unique words ("僕、僕、" -> {"僕"})
+        words = [w for w in _COMMA_SPLIT.split(text.strip()) if w]
+        # Cheap length gate on the short word first; the set() uniqueness
+        # check only runs for segments that could still qualify
+        if words and len(words[0]) <= 3 and len(set(words)) == 1:
+            return words[0]
+        return None
+
+    if not enable_cluster:
+        # Only total counts matter: one C-level Counter pass over the
+        # candidate words instead of building per-word timestamp lists
+        counts = Counter(w for w in (candidate_word(seg[2]) for seg in sub_segments)
+                         if w is not None)
+        return {word for word, count in counts.items() if count >= min_occurrences}
+
+    # Cluster analysis needs each word's occurrence timestamps
     word_occurrences = defaultdict(list)
 
     for seg in sub_segments:
-        if len(seg) == 4:
-            start_time, end_time, text, words = seg
-        else:
-            start_time, end_time, text = seg
-            words = []
-        text_clean = text.strip()
-
-        # Remove commas and count unique words
-        words = re.split(r'[、\s]+', text_clean)
-        words = [w for w in words if w]
-
-        # If segment is just one unique word (possibly repeated with commas like "僕、僕、")
-        if len(set(words)) == 1 and len(words[0]) <= 3:  # Short word
-            word_occurrences[words[0]].append(start_time)
+        word = candidate_word(seg[2])
+        if word is not None:
+            word_occurrences[word].append(seg[0])
 
     # Find words that show hallucination patterns
     hallucination_words = set()
 
-    enable_global = global_word_config.get("enable", False)
-    enable_cluster = cluster_config.get("enable", False)
-
     for word, timestamps in word_occurrences.items():
-        total_count = len(timestamps)
-
-        # Pattern 1: High total count (10+ occurrences) - if global filter enabled
-        if enable_global and total_count >= min_occurrences:
+        if _occurrences_trigger(tuple(timestamps), enable_global, min_occurrences,
+                                enable_cluster, cluster_time_window, cluster_min):
             hallucination_words.add(word)
-            continue
-
-        # Pattern 2: Clustered repetitions (5+ times within a time window) - if cluster filter enabled
-        if enable_cluster and total_count >= 5:
-            timestamps_sorted = sorted(timestamps)
-            for i in range(len(timestamps_sorted)):
-                # Count how many occurrences within the time window from this point
-                cluster_count = 0
-                window_end = timestamps_sorted[i] + cluster_time_window
-
-                for j in range(i, len(timestamps_sorted)):
-                    if timestamps_sorted[j] <= window_end:
-                        cluster_count += 1
-                    else:
-                        break
-
-                # If cluster_min+ occurrences within the window, it's a hallucination
-                if cluster_count >= cluster_min:
-                    hallucination_words.add(word)
-                    break
 
     return hallucination_words
 
 
+@functools.lru_cache(maxsize=4096)
+def _occurrences_trigger(timestamps, enable_global, min_occurrences,
+                         enable_cluster, cluster_time_window, cluster_min):
+    """
+    Pure thresholded decision for one word's occurrence times.
+
+    Takes only hashable arguments so the result is memoized: when directories
+    of files are processed in one run, recurring occurrence patterns under the
+    same thresholds skip the cluster scan entirely.
+    """
+    total_count = len(timestamps)
+
+    # Pattern 1: High total count (10+ occurrences) - if global filter enabled
+    if enable_global and total_count >= min_occurrences:
+        return True
+
+    # Pattern 2: Clustered repetitions (5+ times within a time window) - if cluster filter enabled
+    if enable_cluster and total_count >= 5:
+        # Count occurrences inside each window with one vectorized
+        # searchsorted instead of a Python sliding-window scan
+        ts = np.sort(np.asarray(timestamps, dtype=np.float64))
+        window_counts = np.searchsorted(ts, ts + cluster_time_window, side='right') - np.arange(len(ts))
+
+        # If cluster_min+ occurrences within any window, it's a hallucination
+        if window_counts.max() >= cluster_min:
+            return True
+
+    return False
+
+
 def detect_vocalization_from_text(text, config):
     """Try to detect appropriate vocalization from hallucinated text"""
-    import re
-
     # Get vocalization options
     final_cleanup_config = config.get("final_cleanup", {})
     stammer_config = final_cleanup_config.get("stammer_filter", {})
@@ -141,6 +154,13 @@ def detect_vocalization_from_text(text, config):
     return vocalization_options[0]
 
 
+@functools.lru_cache(maxsize=64)
+def _vocalization_string(base_voc, repeat_count):
+    """Joined vocalization string, memoized so each (voc, count) bucket is
+    built once and the same str object is reused across filtered segments."""
+    return "、".join([base_voc] * repeat_count)
+
+
 def build_vocalization_replacement(base_voc, duration, config):
     """Build vocalization replacement based on duration"""
     final_cleanup_config = config.get("final_cleanup", {})
@@ -148,20 +168,15 @@ def build_vocalization_replacement(base_voc, duration, config):
     replacement = stammer_config.get("vocalization_replacement", {})
     short_threshold = replacement.get("short_duration_threshold", 2.0)
     medium_threshold = replacement.get("medium_duration_threshold", 5.0)
-    short_count = replacement.get("short_repeat_count", 1)
-    medium_count = replacement.get("medium_repeat_count", 2)
-    long_count = replacement.get("long_repeat_count", 3)
 
     if duration < short_threshold:
-        repeat_count = short_count
+        repeat_count = replacement.get("short_repeat_count", 1)
     elif duration < medium_threshold:
-        repeat_count = medium_count
+        repeat_count = replacement.get("medium_repeat_count", 2)
     else:
-        repeat_count = long_count
+        repeat_count = replacement.get("long_repeat_count", 3)
 
-    # Build the replacement string
-    voc_list = [base_voc] * repeat_count
-    return "、".join(voc_list)
+    return _vocalization_string(base_voc, repeat_count)
 
 
 def filter_global_hallucination_words(sub_segments, hallucination_words, config):
@@ -169,10 +184,11 @@ def filter_global_hallucination_words(sub_segments, hallucination_words, config)
     if not hallucination_words:
         return sub_segments
 
+    # frozenset gives O(1) membership probes in the rewrite loop even when a
+    # caller hands us a list of words
+    hallucination_words = frozenset(hallucination_words)
+
     filtered = []
-    final_cleanup_config = config.get("final_cleanup", {})
-    stammer_config = final_cleanup_config.get("stammer_filter", {})
-    replacement = stammer_config.get("vocalization_replacement", {})
 
     for seg in sub_segments:
         if len(seg) == 4:
@@ -183,9 +199,7 @@ def filter_global_hallucination_words(sub_segments, hallucination_words, config)
         text_clean = text.strip()
 
         # Check if this segment is only a hallucination word (with optional commas)
-        import re
-        text_words = re.split(r'[、\s]+', text_clean)
-        text_words = [w for w in text_words if w]
+        text_words = [w for w in _COMMA_SPLIT.split(text_clean) if w]
 
         # If segment is just repetitions of a hallucination word
         if text_words and len(set(text_words)) == 1 and text_words[0] in hallucination_words:
@@ -197,70 +211,67 @@ def filter_global_hallucination_words(sub_segments, hallucination_words, config)
             replacement_text = build_vocalization_replacement(base_voc, duration, config)
             filtered.append((start_time, end_time, replacement_text, word_timestamps))
         else:
-            # Keep segment as-is (preserve word timestamps)
-            filtered.append((start_time, end_time, text, word_timestamps))
+            # Keep segment as-is: reusing the original tuple skips one
+            # allocation per clean segment (and preserves word timestamps)
+            filtered.append(seg)
 
     return filtered
 
 
-def condense_word_repetitions(text, config):
-    """Condense repetitive word patterns using regex. E.g., やめてやめてやめて... -> やめて、やめて、やめて..."""
-    import re
+@functools.lru_cache(maxsize=8)
+def _repetition_pattern(max_pattern_length, min_repetitions):
+    """Compiled repetition pattern for the given config bounds.
 
-    # Get config values
-    final_cleanup_config = config.get("final_cleanup", {})
-    stammer_config = final_cleanup_config.get("stammer_filter", {})
-    word_rep = stammer_config.get("word_repetition", {})
-    max_pattern_length = word_rep.get("max_pattern_length", 15)
+    The greedy {1,max} quantifier tries longer phrases first at each position,
+    so a single C-level scan replaces the old per-length passes over the text.
+    min_repetitions - 1 because the first occurrence is the capture group.
+    """
+    return re.compile(r'(.{1,%d})\1{%d,}' % (max_pattern_length, min_repetitions - 1))
+
+
+def _resolve_condense_settings(config):
+    """Resolve the compiled repetition pattern and display settings from config once."""
+    word_rep = (config.get("final_cleanup", {})
+                .get("stammer_filter", {})
+                .get("word_repetition", {}))
     min_repetitions = word_rep.get("min_repetitions", 5)
-    display_count = word_rep.get("condensed_display_count", 3)
+    pattern = _repetition_pattern(word_rep.get("max_pattern_length", 15),
+                                  min_repetitions)
+    return pattern, word_rep.get("condensed_display_count", 3), min_repetitions
 
-    # Try multiple pattern sizes from largest to smallest to catch longer phrases first
-    # This prevents shorter patterns from consuming parts of longer repetitions
-    for pattern_len in range(max_pattern_length, 0, -1):
-        # Pattern: Detect phrases of exact length repeated min_repetitions+ times
-        # Using greedy matching to prefer longer phrases
-        min_reps_pattern = min_repetitions - 1  # -1 because first match is in capture group
-        pattern = f'(.{{{pattern_len}}})(?:\\1){{{min_reps_pattern},}}'
 
-        def replace_repetition(match):
-            word = match.group(1)
-            full_match = match.group(0)
+def _condense(text, pattern, display_count, min_repetitions):
+    """Condense repetitions with pre-resolved settings (hot per-segment path)."""
+    # A qualifying match is min_repetitions copies of a >=1-char unit, so
+    # shorter texts can't contain one - skip the regex engine entirely
+    if len(text) < min_repetitions:
+        return text
 
-            # Count how many times the phrase repeats
-            repeat_count = len(full_match) // len(word)
+    def replace_repetition(match):
+        # The pattern itself guarantees min_repetitions occurrences, so the
+        # match is always condensed to display_count instances with ellipsis
+        return '、'.join([match.group(1)] * display_count) + '...'
 
-            # Condense to display_count instances with ellipsis
-            if repeat_count >= min_repetitions:
-                parts = [word] * display_count
-                return '、'.join(parts) + '...'
-            else:
-                return full_match
+    return pattern.sub(replace_repetition, text)
 
-        # Apply pattern matching for this length
-        text = re.sub(pattern, replace_repetition, text)
 
-    return text
+def condense_word_repetitions(text, config):
+    """Condense repetitive word patterns using regex. E.g., やめてやめてやめて... -> やめて、やめて、やめて..."""
+    return _condense(text, *_resolve_condense_settings(config))
 
 
-def split_and_filter_repetitive_portions(text, start_time, end_time, config):
+def split_and_filter_repetitive_portions(text, start_time, end_time, pattern, display_count, min_repetitions):
     """Split text into portions and filter out massive character/word repetitions while keeping real dialogue"""
-    import re
-    from collections import Counter
-
     # Step 1: Condense repetitive words (やめて x100 -> やめて、やめて、やめて...)
-    text = condense_word_repetitions(text, config)
+    text = _condense(text, pattern, display_count, min_repetitions)
 
     # Step 2: Handle single character repetitions (はっ x200 -> vocalization)
-    # Pattern: same character repeated 20+ times
-    char_pattern = r'(.)\1{19,}'
-
     parts = []
     last_end = 0
     total_chars = len(text) if len(text) > 0 else 1
     duration = end_time - start_time
 
-    for match in re.finditer(char_pattern, text):
+    for match in _CHAR_REPEAT.finditer(text):
         # Keep the text before the repetition
         if match.start() > last_end:
             before_text = text[last_end:match.start()]
@@ -295,7 +306,6 @@ def filter_repetitive_stammer_segments(sub_segments, config):
     if not sub_segments:
         return sub_segments
 
-    filtered = []
     final_cleanup_config = config.get("final_cleanup", {})
     stammer_config = final_cleanup_config.get("stammer_filter", {})
     replacement = stammer_config.get("vocalization_replacement", {})
@@ -303,7 +313,12 @@ def filter_repetitive_stammer_segments(sub_segments, config):
     # Check if vocalization replacement is enabled (default: False)
     enable_vocalization_replacement = replacement.get("enable", False)
 
-    for seg in sub_segments:
+    # Resolve condensing settings once: the per-segment loop below only ever
+    # touches locals, not the nested config dict
+    pattern, display_count, min_repetitions = _resolve_condense_settings(config)
+
+    def cleaned_entries(seg):
+        """Replacement entries for one segment, or None when it passes through clean"""
         if len(seg) == 4:
             start_time, end_time, text, words = seg
         else:
@@ -316,34 +331,54 @@ def filter_repetitive_stammer_segments(sub_segments, config):
                 base_voc = detect_vocalization_from_text(text, config)
                 duration = end_time - start_time
                 replacement_text = build_vocalization_replacement(base_voc, duration, config)
-                filtered.append((start_time, end_time, replacement_text, []))
-            else:
-                # Keep condensed version without vocalization replacement
-                condensed_text = condense_word_repetitions(text, config)
-                filtered.append((start_time, end_time, condensed_text, words))
-        else:
-            # Check for massive character repetitions within the segment
-            parts = split_and_filter_repetitive_portions(text, start_time, end_time, config)
-
-            for action, part_start, part_end, part_text in parts:
-                if action == 'keep':
-                    # Try to preserve word timestamps for this portion if text unchanged
-                    if part_text == text and words:
-                        filtered.append((part_start, part_end, part_text, words))
-                    else:
-                        filtered.append((part_start, part_end, part_text, []))
-                elif action == 'replace':
-                    if enable_vocalization_replacement:
-                        # Replace repetitive portion with vocalization (loses word timestamps)
-                        base_voc = detect_vocalization_from_text(part_text, config)
-                        duration = part_end - part_start
-                        replacement_text = build_vocalization_replacement(base_voc, duration, config)
-                        filtered.append((part_start, part_end, replacement_text, []))
-                    else:
-                        # Keep condensed version without vocalization replacement
-                        condensed_text = condense_word_repetitions(part_text, config)
-                        filtered.append((part_start, part_end, condensed_text, []))
+                return [(start_time, end_time, replacement_text, [])]
+            # Keep condensed version without vocalization replacement
+            condensed_text = _condense(text, pattern, display_count, min_repetitions)
+            if condensed_text == text:
+                return None
+            return [(start_time, end_time, condensed_text, words)]
+
+        # Check for massive character repetitions within the segment
+        parts = split_and_filter_repetitive_portions(text, start_time, end_time,
+                                                     pattern, display_count,
+                                                     min_repetitions)
+        if len(parts) == 1 and parts[0] == ('keep', start_time, end_time, text):
+            return None
+
+        entries = []
+        for action, part_start, part_end, part_text in parts:
+            if action == 'keep':
+                # Try to preserve word timestamps for this portion if text unchanged
+                if part_text == text and words:
+                    entries.append((part_start, part_end, part_text, words))
+                else:
+                    entries.append((part_start, part_end, part_text, []))
+            elif action == 'replace':
+                if enable_vocalization_replacement:
+                    # Replace repetitive portion with vocalization (loses word timestamps)
+                    base_voc = detect_vocalization_from_text(part_text, config)
+                    duration = part_end - part_start
+                    replacement_text = build_vocalization_replacement(base_voc, duration, config)
+                    entries.append((part_start, part_end, replacement_text, []))
+                else:
+                    # Keep condensed version without vocalization replacement
+                    condensed_text = _condense(part_text, pattern, display_count, min_repetitions)
+                    entries.append((part_start, part_end, condensed_text, []))
+        return entries
+
+    # Copy-on-write: only allocate the output list once a segment actually
+    # changes, so fully clean transcripts are returned as-is
+    filtered = None
+    for i, seg in enumerate(sub_segments):
+        entries = cleaned_entries(seg)
+        if entries is None:
+            if filtered is not None:
+                filtered.append(seg)
+            continue
+        if filtered is None:
+            filtered = list(sub_segments[:i])
+        filtered.extend(entries)
 
-    return filtered
+    return sub_segments if filtered is None else filtered
 
 
@@ -4,7 +4,20 @@ Stage 8: VTT Generation
 Writes processed segments to WebVTT format subtitle file.
 """
 
-from shared.text_utils import format_timestamp
+import os
+
+from shared.text_utils import format_timestamps_bulk
+
+
+def _iter_cues(adjusted):
+    """Yield the VTT header and one formatted block per (start, end, text) cue"""
+    yield "WEBVTT\n\n"
+    # Vectorized formatting: both timestamp columns are converted with one
+    # NumPy pass each instead of two Python calls per cue
+    starts = format_timestamps_bulk([seg[0] for seg in adjusted])
+    ends = format_timestamps_bulk([seg[1] for seg in adjusted])
+    for segment_num, (seg, start_ts, end_ts) in enumerate(zip(adjusted, starts, ends), 1):
+        yield f"{segment_num}\n{start_ts} --> {end_ts}\n{seg[2]}\n\n"
 
 
 def write_vtt_file(segments, output_path, config):
@@ -13,50 +26,45 @@ def write_vtt_file(segments, output_path, config):
 
     Args:
         segments: List of (start, end, text, words) tuples (already processed)
-        output_path: Path to output VTT file
+        output_path: Path to output VTT file, or any object with a write
+            method (e.g. io.StringIO) to receive the content directly
         config: Configuration dict
     """
-    print(f"  - Writing VTT file: {output_path}")
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("WEBVTT\n\n")
-
-        segment_num = 1
-        gap_start_time = None
-
-        for i, seg in enumerate(segments):
-            # Extract segment data
-            if len(seg) == 4:
-                start_time, end_time, text, words = seg
-            else:
-                start_time, end_time, text = seg
-                words = []
-
-            # Clean text
-            text = text.strip()
-            if not text:
-                continue
-
-            # Gap filling: Extend start time to fill small gaps
-            # Only if segment doesn't have word timestamps (to avoid conflicts)
-            if gap_start_time is not None:
-                has_word_timestamps = (len(seg) == 4 and seg[3])
-                if not has_word_timestamps:
-                    start_time = gap_start_time
-                gap_start_time = None
-
-            # Format timestamps
-            start_str = format_timestamp(start_time)
-            end_str = format_timestamp(end_time)
-
-            # Write segment
-            f.write(f"{segment_num}\n")
-            f.write(f"{start_str} --> {end_str}\n")
-            f.write(f"{text}\n\n")
-
-            segment_num += 1
-
-            # Track end time for potential gap filling
-            gap_start_time = end_time
-
-    print(f"  - Wrote {segment_num - 1} segments")
+    # Gap-filling pre-pass: drop empty cues and extend each start time to the
+    # previous cue's end when the segment has no word timestamps (which would
+    # conflict). One sweep here keeps the write loop branch-free.
+    adjusted = []
+    prev_end = None
+
+    for seg in segments:
+        # Extract segment data: one starred unpack covers both 3- and 4-tuples
+        start_time, end_time, text, *rest = seg
+        words = rest[0] if rest else []
+
+        # Skip empty cues without allocating: isspace scans in C, while
+        # strip() would build a new string just for the truthiness test
+        if not text or text.isspace():
+            continue
+        text = text.strip()
+
+        if prev_end is not None and not words:
+            start_time = prev_end
+        adjusted.append((start_time, end_time, text))
+        prev_end = end_time
+
+    if hasattr(output_path, 'write'):
+        # Duck-typed file-like consumer (StringIO, socket wrapper): stream
+        # directly with no filesystem round-trip; the caller owns the handle
+        output_path.writelines(_iter_cues(adjusted))
+    else:
+        # os.fspath is a C builtin that passes str through untouched and
+        # unwraps Path objects without constructing a new one
+        output_path = os.fspath(output_path)
+
+        # Stream cue blocks through writelines with a large buffer: memory
+        # stays bounded for huge transcripts while syscalls stay amortized
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(_iter_cues(adjusted))
+
+    # Single print covers both report lines: one stdout lock acquisition
+    print(f"  - Writing VTT file: {output_path}\n  - Wrote {len(adjusted)} segments")
@@ -9,6 +9,8 @@ setup(
         'openai-whisper>=20230314',
         'torch>=2.0.0',
         'numpy>=1.20.0',
+        'rapidfuzz>=3.0.0',
+        'orjson>=3.8.0',
         'anthropic>=0.3.0',  # Optional: for LLM features
     ],
     entry_points={
@@ -1,5 +1,6 @@
 """Shared utilities package"""
 
 from .whisper_utils import transcribe_with_config, load_audio_safely
+from .segment import Segment, as_segment
 
-__all__ = ['transcribe_with_config', 'load_audio_safely']
+__all__ = ['transcribe_with_config', 'load_audio_safely', 'Segment', 'as_segment']
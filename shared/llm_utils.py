@@ -1,10 +1,25 @@
 """Unified LLM provider abstraction for flexible model usage"""
 
+import functools
 import os
 import json
 from typing import Optional, Dict, Any, List
 
 
+@functools.lru_cache(maxsize=4)
+def _get_cached_client(client_class, api_key):
+    """
+    Build (or reuse) an Anthropic client for this api_key.
+
+    Constructing a client sets up a fresh HTTP connection pool, so every new
+    instance pays a TCP + TLS handshake on its first request. Caching per
+    (class, api_key) lets keep-alive reuse the connection across stages and
+    repeated polishing calls. Keyed on the class object as well so a different
+    client implementation never collides with a cached one.
+    """
+    return client_class(api_key=api_key)
+
+
 class LLMProvider:
     """Base class for LLM providers"""
 
@@ -39,10 +54,13 @@ class AnthropicProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("Anthropic API key not found in config or environment")
 
-        self.client = self.anthropic(api_key=self.api_key)
+        self.client = _get_cached_client(self.anthropic, self.api_key)
         self.model = anthropic_config.get("model") or config.get("model", "claude-3-5-haiku-20241022")
 
-    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.0) -> str:
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.0,
+                 tools: Optional[List[Dict[str, Any]]] = None,
+                 tool_choice: Optional[Dict[str, Any]] = None,
+                 system: Optional[List[Dict[str, Any]]] = None) -> str:
         """
         Generate text using Anthropic Claude
 
@@ -50,9 +68,14 @@ class AnthropicProvider(LLMProvider):
             prompt: The input prompt
             max_tokens: Maximum tokens to generate (0 = use 4096 as reasonable default)
             temperature: Sampling temperature
+            tools: Optional tool definitions for structured output
+            tool_choice: Optional forced tool selection
+            system: Optional system blocks (supports prompt-caching cache_control)
 
         Returns:
-            Generated text response
+            Generated text response. When a tool_use block comes back, its
+            input is returned as serialized JSON so callers parse one
+            well-formed document instead of free-form text.
 
         Note: Anthropic requires max_tokens, so 0 is converted to 4096 (reasonable default)
         """
@@ -60,14 +83,102 @@ class AnthropicProvider(LLMProvider):
         if max_tokens == 0:
             max_tokens = 4096  # Reasonable default for unlimited intent
 
-        message = self.client.messages.create(
+        request_kwargs = dict(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
             messages=[{"role": "user", "content": prompt}]
         )
+        if tools:
+            request_kwargs["tools"] = tools
+            if tool_choice:
+                request_kwargs["tool_choice"] = tool_choice
+        if system:
+            request_kwargs["system"] = system
+
+        message = self.client.messages.create(**request_kwargs)
+
+        # Structured output arrives as a tool_use block with parsed input;
+        # serialize it so the caller's JSON pipeline stays uniform
+        if tools:
+            for block in message.content:
+                if getattr(block, "type", None) == "tool_use":
+                    return json.dumps(block.input, ensure_ascii=False)
+
         return message.content[0].text.strip()
 
+    def generate_many(self, prompts: List[str], max_tokens: int = 1024, temperature: float = 0.0,
+                      max_concurrency: int = 8,
+                      tools: Optional[List[Dict[str, Any]]] = None,
+                      tool_choice: Optional[Dict[str, Any]] = None,
+                      system: Optional[List[Dict[str, Any]]] = None) -> List[Any]:
+        """
+        Generate responses for many prompts concurrently.
+
+        Uses AsyncAnthropic with a bounded semaphore so up to max_concurrency
+        requests are in flight at once. For a network-bound workload this cuts
+        wall time from O(num_prompts * RTT) to
+        O(ceil(num_prompts / max_concurrency) * RTT).
+
+        Args:
+            prompts: List of input prompts
+            max_tokens: Maximum tokens to generate per prompt (0 = 4096)
+            temperature: Sampling temperature
+            max_concurrency: Maximum number of in-flight requests
+            tools: Optional tool definitions for structured output
+            tool_choice: Optional forced tool selection
+            system: Optional system blocks (supports prompt-caching
+                cache_control), shared by every request
+
+        Returns:
+            List aligned with prompts; each entry is the response text (a
+            tool_use block is serialized as JSON, matching generate()), or the
+            exception raised for that prompt (so callers can retry per-prompt)
+        """
+        if max_tokens == 0:
+            max_tokens = 4096
+
+        import asyncio
+        from anthropic import AsyncAnthropic
+
+        # Same request shape as generate(): the concurrent path must honor
+        # the identical system/tools contract or prompt caching and
+        # structured output silently stop applying on multi-batch jobs
+        common_kwargs = dict(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if tools:
+            common_kwargs["tools"] = tools
+            if tool_choice:
+                common_kwargs["tool_choice"] = tool_choice
+        if system:
+            common_kwargs["system"] = system
+
+        async def _run():
+            client = AsyncAnthropic(api_key=self.api_key)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def _call(prompt):
+                async with semaphore:
+                    message = await client.messages.create(
+                        messages=[{"role": "user", "content": prompt}],
+                        **common_kwargs
+                    )
+                    if tools:
+                        for block in message.content:
+                            if getattr(block, "type", None) == "tool_use":
+                                return json.dumps(block.input, ensure_ascii=False)
+                    return message.content[0].text.strip()
+
+            try:
+                return await asyncio.gather(*[_call(p) for p in prompts], return_exceptions=True)
+            finally:
+                await client.close()
+
+        return asyncio.run(_run())
+
 
 class OllamaProvider(LLMProvider):
     """Ollama local model provider with automatic management"""
@@ -1,17 +1,43 @@
 """Response fixing utility for handling malformed LLM JSON responses"""
 
+import functools
 import re
 import json
 from typing import Dict, Any, Optional, List
 from shared.logger import get_logger
 
+# Prefer orjson's C parser when available: same parse results, roughly 3x
+# faster on the small JSON payloads the polishing stage produces per segment.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except
+# clauses below catch failures from either parser.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
 logger = get_logger()
 
+# Patterns compiled once at import: fix_response runs per polished segment,
+# so per-call re.compile/module-cache lookups add up over long transcripts
+_JAPANESE_CHAR = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+_MD_FENCE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_JSON_MARKER = re.compile(r'^【JSON】\s*\n?', re.MULTILINE)
+_JSON_MARKER_ASCII = re.compile(r'^\[JSON\]\s*\n?', re.MULTILINE)
+_NUMBERED_ITEM = re.compile(r'^\d+[\.\)]\s*(.+)$')
+_NUMBER_PREFIX = re.compile(r'^\d+[\.\)]\s*')
+_ANY_ARRAY = re.compile(r'\[([^\[\]]*)\]')
+_QUOTED = re.compile(r'["\']([^"\']+)["\']')
+
+
+@functools.lru_cache(maxsize=8)
+def _key_object_pattern(expected_key: str):
+    """Compiled {"<key>": [...]} extractor, cached per expected key"""
+    return re.compile(r'\{[^}]*"' + re.escape(expected_key) + r'"[^}]*\[[^\]]*\][^}]*\}')
+
 
 def contains_japanese(text: str) -> bool:
     """Check if text contains Japanese characters (hiragana, katakana, or kanji)"""
-    japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
-    return bool(japanese_pattern.search(text))
+    return bool(_JAPANESE_CHAR.search(text))
 
 
 class ResponseFixer:
@@ -32,37 +58,18 @@ class ResponseFixer:
         if not response_text or not response_text.strip():
             return None
 
-        original_text = response_text
-        text = response_text.strip()
-
-        # Try each fixing strategy in order
-        strategies = [
-            ResponseFixer._try_direct_parse,
-            ResponseFixer._fix_markdown_json,
-            ResponseFixer._fix_json_marker_format,
-            ResponseFixer._fix_numbered_list_format,
-            ResponseFixer._fix_plain_array,
-            ResponseFixer._fix_incomplete_json,
-            ResponseFixer._fix_extra_data,
-            ResponseFixer._extract_any_array,
-        ]
-
-        for strategy in strategies:
-            try:
-                result = strategy(text, expected_key)
-                if result is not None:
-                    return result
-            except Exception:
-                # Continue to next strategy silently
-                continue
-
-        # All strategies failed - no logging needed, caller will handle
-        return None
+        result = _fix_response_cached(response_text.strip(), expected_key)
+        if result is None:
+            return None
+        # Shallow-copy the lists so a caller mutating the result cannot
+        # poison the cached entry
+        return {key: list(value) if isinstance(value, list) else value
+                for key, value in result.items()}
 
     @staticmethod
     def _try_direct_parse(text: str, expected_key: str) -> Optional[Dict[str, Any]]:
         """Try parsing as-is (might already be valid JSON)"""
-        result = json.loads(text)
+        result = _loads(text)
         if isinstance(result, dict) and expected_key in result:
             return result
         return None
@@ -71,11 +78,10 @@ class ResponseFixer:
     def _fix_markdown_json(text: str, expected_key: str) -> Optional[Dict[str, Any]]:
         """Fix JSON wrapped in markdown code blocks"""
         # Remove markdown code blocks
-        json_pattern = r'```(?:json)?\s*(.*?)\s*```'
-        match = re.search(json_pattern, text, re.DOTALL)
+        match = _MD_FENCE.search(text)
         if match:
             json_text = match.group(1).strip()
-            result = json.loads(json_text)
+            result = _loads(json_text)
             if isinstance(result, dict) and expected_key in result:
                 return result
         return None
@@ -90,13 +96,13 @@ class ResponseFixer:
         Convert to: {"polished": ["text1", "text2"]}
         """
         # Remove 【JSON】 marker and similar patterns
-        text = re.sub(r'^【JSON】\s*\n?', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\[JSON\]\s*\n?', '', text, flags=re.MULTILINE)
+        text = _JSON_MARKER.sub('', text)
+        text = _JSON_MARKER_ASCII.sub('', text)
         text = text.strip()
 
         # Try parsing as array
         try:
-            result = json.loads(text)
+            result = _loads(text)
             if isinstance(result, list):
                 return {expected_key: result}
         except json.JSONDecodeError:
@@ -122,7 +128,7 @@ class ResponseFixer:
                 continue
 
             # Match patterns like "1. text" or "1) text" or "1 text"
-            match = re.match(r'^\d+[\.\)]\s*(.+)$', line)
+            match = _NUMBERED_ITEM.match(line)
             if match:
                 items.append(match.group(1))
             # If line doesn't match pattern but we already have items, might be continuation
@@ -144,7 +150,7 @@ class ResponseFixer:
         Convert to: {"polished": ["text1", "text2"]}
         """
         try:
-            result = json.loads(text)
+            result = _loads(text)
             if isinstance(result, list):
                 return {expected_key: result}
         except json.JSONDecodeError:
@@ -180,7 +186,7 @@ class ResponseFixer:
             fixed_text += '}' * (open_braces - close_braces)
 
         try:
-            result = json.loads(fixed_text)
+            result = _loads(fixed_text)
             if isinstance(result, dict) and expected_key in result:
                 return result
         except json.JSONDecodeError:
@@ -207,11 +213,10 @@ class ResponseFixer:
 
         # Try to extract just the JSON portion using regex
         # Look for {"key": [...]}
-        pattern = r'\{[^}]*"' + re.escape(expected_key) + r'"[^}]*\[[^\]]*\][^}]*\}'
-        match = re.search(pattern, text)
+        match = _key_object_pattern(expected_key).search(text)
         if match:
             try:
-                result = json.loads(match.group(0))
+                result = _loads(match.group(0))
                 if isinstance(result, dict) and expected_key in result:
                     return result
             except json.JSONDecodeError:
@@ -226,22 +231,20 @@ class ResponseFixer:
         Look for anything between [ and ]
         """
         # Find all array patterns
-        array_pattern = r'\[([^\[\]]*)\]'
-        matches = re.findall(array_pattern, text)
+        matches = _ANY_ARRAY.findall(text)
 
         for match in matches:
             try:
                 # Try to parse as JSON array
                 array_text = '[' + match + ']'
-                result = json.loads(array_text)
+                result = _loads(array_text)
                 if isinstance(result, list):
                     return {expected_key: result}
             except json.JSONDecodeError:
                 continue
 
         # If still no luck, try to extract quoted strings
-        quoted_pattern = r'["\']([^"\']+)["\']'
-        quoted_matches = re.findall(quoted_pattern, text)
+        quoted_matches = _QUOTED.findall(text)
         # Filter out the expected_key itself (it's the JSON key, not a value)
         quoted_matches = [m for m in quoted_matches if m != expected_key]
         if quoted_matches:
@@ -251,8 +254,8 @@ class ResponseFixer:
         # Only if it contains Japanese (likely actual content, not English error message)
         if len(text) < 200 and contains_japanese(text):
             # Remove common prefixes
-            text = re.sub(r'^\d+[\.\)]\s*', '', text)
-            text = re.sub(r'^【JSON】\s*', '', text)
+            text = _NUMBER_PREFIX.sub('', text, count=1)
+            text = _JSON_MARKER.sub('', text, count=1)
             if text.strip():
                 return {expected_key: [text.strip()]}
 
@@ -260,6 +263,38 @@ class ResponseFixer:
         return None
 
 
+@functools.lru_cache(maxsize=1024)
+def _fix_response_cached(text: str, expected_key: str) -> Optional[Dict[str, Any]]:
+    """Run the fixing strategies, memoized on the (text, key) pair.
+
+    Polishing retries often replay identical malformed responses, so
+    repeated inputs skip the whole regex + json.loads cascade.
+    """
+    # Try each fixing strategy in order
+    strategies = [
+        ResponseFixer._try_direct_parse,
+        ResponseFixer._fix_markdown_json,
+        ResponseFixer._fix_json_marker_format,
+        ResponseFixer._fix_numbered_list_format,
+        ResponseFixer._fix_plain_array,
+        ResponseFixer._fix_incomplete_json,
+        ResponseFixer._fix_extra_data,
+        ResponseFixer._extract_any_array,
+    ]
+
+    for strategy in strategies:
+        try:
+            result = strategy(text, expected_key)
+            if result is not None:
+                return result
+        except Exception:
+            # Continue to next strategy silently
+            continue
+
+    # All strategies failed - no logging needed, caller will handle
+    return None
+
+
 def fix_and_parse_response(
     response_text: str,
     expected_key: str = "polished",
@@ -291,7 +326,7 @@ def fix_and_parse_response(
 
     # Check if we had to fix the response (wasn't valid JSON originally)
     try:
-        original_parse = json.loads(response_text.strip())
+        original_parse = _loads(response_text.strip())
         if original_parse != result and log_fixes:
             logger.info(f"Applied response fix: {response_text[:100]}... -> {str(result)[:100]}...")
     except json.JSONDecodeError:
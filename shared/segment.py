@@ -0,0 +1,30 @@
+"""Compact segment record shared across pipeline stages"""
+
+from typing import Any, Dict, List, NamedTuple
+
+
+class Segment(NamedTuple):
+    """
+    One subtitle segment: (start, end, text, words).
+
+    A NamedTuple stays fully tuple-compatible (indexing, unpacking, equality
+    against plain tuples), so stages that still build or consume raw tuples
+    interoperate unchanged. Compared to ad-hoc tuples it adds attribute
+    access for new code paths and a fixed C-level field layout, which keeps
+    per-segment overhead down on transcripts with thousands of segments.
+    """
+    start: float
+    end: float
+    text: str
+    # No default on purpose: a mutable [] default would be one shared list
+    # aliased by every default-constructed Segment. Callers pass their own.
+    words: List[Dict[str, Any]]
+
+
+def as_segment(seg) -> Segment:
+    """Coerce a legacy 3- or 4-tuple (or Segment) to a Segment"""
+    if isinstance(seg, Segment):
+        return seg
+    if len(seg) >= 4:
+        return Segment(seg[0], seg[1], seg[2], seg[3])
+    return Segment(seg[0], seg[1], seg[2], [])
@@ -1,9 +1,23 @@
 """Basic utility functions for text and timestamp processing"""
 
-from datetime import timedelta
-import subprocess
-import re
 import difflib
+import functools
+import shutil
+
+# Characters dropped when normalizing text for comparison. Every stage that
+# compares transcript text (similarity, matching, dedup) should normalize
+# through normalize_text so they all agree on what counts as equal.
+DROP_CHARS = ' \t\n\r\f\v　、。！？'
+_DROP_TABLE = str.maketrans('', '', DROP_CHARS)
+
+
+def normalize_text(text):
+    """Strip punctuation and whitespace for text comparison.
+
+    Uses a precomputed str.translate table, which is a single C-level pass -
+    faster than running a regex substitution per call.
+    """
+    return text.translate(_DROP_TABLE)
 
 
 def calculate_text_similarity(text1, text2):
@@ -28,8 +42,8 @@ def calculate_text_similarity(text1, text2):
         Similarity ratio from 0.0 (completely different) to 1.0 (identical)
     """
     # Remove common punctuation and spaces for comparison
-    clean1 = re.sub(r'[、。！？\s]', '', text1)
-    clean2 = re.sub(r'[、。！？\s]', '', text2)
+    clean1 = normalize_text(text1)
+    clean2 = normalize_text(text2)
 
     # Edge case: empty strings mean no content to compare
     if not clean1 or not clean2:
@@ -42,23 +56,65 @@ def calculate_text_similarity(text1, text2):
     return matcher.ratio()
 
 
+@functools.lru_cache(maxsize=1)
 def check_ffmpeg():
-    """Check if ffmpeg is available"""
-    try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    """Check if ffmpeg is available (probed once per process)"""
+    # PATH lookup instead of spawning `ffmpeg -version`: same answer,
+    # no subprocess fork/exec on every CLI startup
+    return shutil.which('ffmpeg') is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def _hhmmss(secs):
+    """HH:MM:SS prefix for a whole-second value, memoized across cues.
+
+    Consecutive cues usually share the same second, so the divmod chain and
+    f-string run once per distinct second instead of once per timestamp.
+    """
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
 def format_timestamp(seconds):
     """Convert seconds to VTT timestamp format (HH:MM:SS.mmm)"""
-    td = timedelta(seconds=seconds)
-    hours = td.seconds // 3600
-    minutes = (td.seconds % 3600) // 60
-    secs = td.seconds % 60
-    millis = td.microseconds // 1000
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+    # Round total milliseconds first so the .999 boundary carries into the
+    # seconds correctly, then reuse the cached HH:MM:SS prefix. Negative
+    # inputs (drifted alignment offsets) clamp to zero rather than wrapping.
+    secs, millis = divmod(max(0, round(seconds * 1000)), 1000)
+    return f"{_hhmmss(secs)}.{millis:03d}"
+
+
+def format_timestamps_bulk(seconds):
+    """Format many timestamps to HH:MM:SS.mmm strings in one vectorized pass.
+
+    Same semantics as format_timestamp (millisecond rounding, negative clamp)
+    but the divmod chain runs once over int64 arrays instead of per value.
+
+    Args:
+        seconds: Iterable or array of timestamps in seconds
+
+    Returns:
+        NumPy array of formatted timestamp strings
+    """
+    import numpy as np  # Deferred so light CLI paths skip the numpy import
+
+    millis = np.rint(np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+    if millis.size == 0:
+        # np.char.zfill cannot derive a width from a zero-size array
+        return np.empty(0, dtype=str)
+    np.clip(millis, 0, None, out=millis)
+    secs, millis = np.divmod(millis, 1000)
+    minutes, secs = np.divmod(secs, 60)
+    hours, minutes = np.divmod(minutes, 60)
+
+    def pad(values, width):
+        return np.char.zfill(values.astype(str), width)
+
+    out = pad(hours, 2)
+    for part in (':', pad(minutes, 2), ':', pad(secs, 2), '.', pad(millis, 3)):
+        out = np.char.add(out, part)
+    return out
 
 
 def clean_sound_effects(text):
@@ -75,56 +131,47 @@ def simplify_repetitions(text):
     return text.strip()
 
 
+# Priority break points for line splitting: sentence enders first, then
+# particles/commas. Frozensets give O(1) membership in the scan below.
+_PRIMARY_BREAKS = frozenset('。？！')
+_SECONDARY_BREAKS = frozenset('、がをにでとのはもてたねよわばし')
+
+
 def split_long_lines(text, max_length=20):
     """Split long lines into multiple lines for better readability"""
-    if len(text) <= max_length:
+    n = len(text)
+    if n <= max_length:
         return text
 
-    # Priority break points (higher priority first)
-    primary_breaks = ['。', '？', '！']  # Sentence enders
-    secondary_breaks = ['、', 'が', 'を', 'に', 'で', 'と', 'の', 'は', 'も', 'て', 'た', 'ね', 'よ', 'わ', 'ば', 'けど', 'から', 'し']  # Particles and conjunctions
-
     lines = []
-    current_line = ""
-
-    i = 0
-    while i < len(text):
-        char = text[i]
-        current_line += char
-
-        # Check if we should break
-        if len(current_line) >= max_length:
-            # Look for primary break points first (within next 5 chars)
-            found_break = False
-            for j in range(5):
-                if i + j < len(text) and text[i + j] in primary_breaks:
-                    # Add remaining chars up to break point
-                    current_line += text[i+1:i+j+1]
-                    lines.append(current_line)
-                    current_line = ""
-                    i = i + j
-                    found_break = True
+    pos = 0
+
+    # Jump a whole line at a time instead of accumulating char by char:
+    # each iteration emits one line, so the loop runs n/max_length times
+    while pos < n:
+        if n - pos <= max_length:
+            lines.append(text[pos:])
+            break
+
+        # Index of the character that fills this line to max_length
+        i = pos + max_length - 1
+
+        # Look for a sentence ender within the next 5 chars, then a
+        # particle/comma within the next 3; otherwise force the break
+        break_at = -1
+        for j in range(5):
+            if i + j < n and text[i + j] in _PRIMARY_BREAKS:
+                break_at = i + j
+                break
+        if break_at < 0:
+            for j in range(3):
+                if i + j < n and text[i + j] in _SECONDARY_BREAKS:
+                    break_at = i + j
                     break
+        if break_at < 0:
+            break_at = i
 
-            # If no primary break, look for secondary breaks
-            if not found_break:
-                for j in range(3):
-                    if i + j < len(text) and text[i + j] in secondary_breaks:
-                        current_line += text[i+1:i+j+1]
-                        lines.append(current_line)
-                        current_line = ""
-                        i = i + j
-                        found_break = True
-                        break
-
-            # If still no break, force break at current position
-            if not found_break:
-                lines.append(current_line)
-                current_line = ""
-
-        i += 1
-
-    if current_line:
-        lines.append(current_line)
+        lines.append(text[pos:break_at + 1])
+        pos = break_at + 1
 
     return '\n'.join(lines)
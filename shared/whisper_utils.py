@@ -1,10 +1,53 @@
 """Shared Whisper transcription utilities"""
 
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def _cuda_available():
+    """Probe CUDA availability once per process"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def _default_fp16(whisper_config):
+    """Half precision by default exactly when inference runs on CUDA.
+
+    Mirrors main()'s device selection: an explicit "cuda"/"cpu" setting wins,
+    and "auto" resolves through the CUDA probe. Keying off the config string
+    alone decoded GPU runs in FP32 (the shipped config says "auto"), while
+    the probe alone forced fp16 on CPU runs on CUDA hosts.
+    """
+    device = whisper_config.get("device", "auto")
+    if device == "auto":
+        return _cuda_available()
+    return device == "cuda"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_audio_cached(path, mtime):
+    """Decode audio via Whisper, cached on (path, mtime).
+
+    whisper.load_audio shells out to ffmpeg and decodes the whole file, so
+    repeated loads of the same unmodified file (e.g. multiple realignment
+    passes over one media file) are served from the cache. The mtime key
+    invalidates entries when the file changes on disk.
+    """
+    import whisper
+    return whisper.load_audio(path)
+
 
 def load_audio_safely(media_path):
     """
     Load audio file using Whisper's audio loader with error handling.
 
+    Repeated loads of the same unmodified file hit a small LRU cache instead
+    of re-running ffmpeg decode.
+
     Args:
         media_path: Path to audio file
 
@@ -13,10 +56,15 @@ def load_audio_safely(media_path):
         - audio_array: Loaded audio or None if failed
         - success: Boolean indicating if load was successful
     """
-    import whisper
+    path = str(media_path)
     try:
-        audio = whisper.load_audio(str(media_path))
-        return audio, True
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            # Path isn't stat-able (pipes, test doubles) - load without caching
+            import whisper
+            return whisper.load_audio(path), True
+        return _load_audio_cached(path, mtime), True
     except Exception as e:
         print(f"  - Warning: Failed to load audio: {e}")
         return None, False
@@ -69,7 +117,7 @@ def transcribe_with_config(model, audio_segment, config, word_timestamps=False,
         'beam_size': whisper_config.get("beam_size", 5),
         'best_of': whisper_config.get("best_of", 5),
         'patience': whisper_config.get("patience", 2.0),
-        'fp16': True if whisper_config.get("device") == "cuda" else False
+        'fp16': whisper_config.get("fp16", _default_fp16(whisper_config))
     }
 
     # Apply overrides (for special use cases like initial_prompt, temperature, etc.)
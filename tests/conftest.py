@@ -4,6 +4,50 @@ import pytest
 import json
 from pathlib import Path
 
+import numpy as np
+
+
+@pytest.fixture(autouse=True)
+def app_logger_tmp_dir(tmp_path):
+    """Route AppLogger output into pytest's tmp dir.
+
+    The global logger defaults to transcripts/logs in the working tree, so
+    without this every test that trips a JSON decode error leaves artifact
+    files behind. Handlers are rebuilt lazily, so dropping them here makes
+    the next log call recreate them under tmp_path.
+    """
+    from shared.logger import get_logger
+    app_logger = get_logger()
+    original_dir = app_logger.log_dir
+    app_logger.log_dir = str(tmp_path / "logs")
+    for handler in list(app_logger.logger.handlers):
+        app_logger.logger.removeHandler(handler)
+        handler.close()
+    app_logger._handlers_setup = False
+    yield
+    for handler in list(app_logger.logger.handlers):
+        app_logger.logger.removeHandler(handler)
+        handler.close()
+    app_logger._handlers_setup = False
+    app_logger.log_dir = original_dir
+
+
+@pytest.fixture
+def fake_audio():
+    """Factory for silent audio arrays without allocating real buffers.
+
+    Returns a zero-stride view over a single shared element, so any length of
+    "silence" costs constant memory. The view is read-only: tests that only
+    slice and measure audio (like the realignment mocks) work unchanged, while
+    accidental writes fail loudly.
+    """
+    def _make(n_samples):
+        base = np.zeros(1, dtype=np.float32)
+        return np.lib.stride_tricks.as_strided(
+            base, shape=(n_samples,), strides=(0,), writeable=False
+        )
+    return _make
+
 
 @pytest.fixture
 def sample_config():
@@ -0,0 +1,78 @@
+"""Unit tests for the persistent model-server daemon protocol"""
+
+import json
+import os
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from core.daemon import run_daemon, submit_job
+
+
+def _start_daemon(tmp_path, name="daemon.sock"):
+    """Start run_daemon on a tmp socket in a background thread.
+
+    Missing-file and malformed-request paths answer before the model is ever
+    touched, so the protocol is testable with model=None. The thread parks in
+    serve_forever and is reaped at process exit (daemon=True).
+    """
+    socket_path = str(tmp_path / name)
+    thread = threading.Thread(
+        target=run_daemon, args=(None, str(tmp_path), {}),
+        kwargs={"socket_path": socket_path}, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            return socket_path
+        time.sleep(0.05)
+    pytest.fail("daemon socket never appeared")
+
+
+class TestSubmitJob:
+    """Test the client side of the line-JSON protocol"""
+
+    def test_missing_file_returns_error(self, tmp_path):
+        """A nonexistent media path is rejected server-side"""
+        socket_path = _start_daemon(tmp_path)
+
+        response = submit_job(str(tmp_path / "nope.wav"), socket_path=socket_path)
+
+        assert response["ok"] is False
+        assert "file not found" in response["error"]
+
+    def test_successful_job_returns_vtt_path(self, tmp_path):
+        """A valid file runs the pipeline and returns the VTT path"""
+        media = tmp_path / "clip.wav"
+        media.write_bytes(b"")
+        vtt = tmp_path / "clip.vtt"
+
+        with patch("core.pipeline.run_pipeline", return_value=vtt):
+            socket_path = _start_daemon(tmp_path, name="success.sock")
+            response = submit_job(str(media), socket_path=socket_path)
+
+        assert response == {"ok": True, "vtt": str(vtt)}
+
+    def test_connection_refused_mentions_daemon_flag(self, tmp_path):
+        """No listening daemon yields the start-one hint, not a traceback"""
+        response = submit_job("clip.wav", socket_path=str(tmp_path / "absent.sock"))
+
+        assert response["ok"] is False
+        assert "--daemon" in response["error"]
+
+
+class TestDaemonProtocol:
+    """Test the server side against raw socket input"""
+
+    def test_invalid_json_request_rejected(self, tmp_path):
+        """A garbage request line gets an error response, not a hung socket"""
+        socket_path = _start_daemon(tmp_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(b"this is not json\n")
+            line = client.makefile(encoding="utf-8").readline()
+
+        assert json.loads(line) == {"ok": False, "error": "invalid JSON request"}
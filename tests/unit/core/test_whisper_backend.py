@@ -0,0 +1,96 @@
+"""Unit tests for Whisper backend selection"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.whisper_backend import FasterWhisperAdapter, load_whisper_model
+
+
+class TestLoadWhisperModel:
+    def test_openai_backend_default(self):
+        """Default backend loads through whisper.load_model"""
+        config = {"whisper": {"model": "large-v3"}}
+        mock_whisper = MagicMock()
+
+        with patch.dict('sys.modules', {'whisper': mock_whisper}):
+            model = load_whisper_model(config, "cpu")
+
+        mock_whisper.load_model.assert_called_once_with("large-v3", device="cpu")
+        assert model is mock_whisper.load_model.return_value
+
+    def test_compile_flag_wraps_encoder(self):
+        """whisper.compile=True runs torch.compile over the encoder"""
+        config = {"whisper": {"model": "base", "compile": True}}
+        mock_whisper = MagicMock()
+        mock_torch = MagicMock()
+
+        with patch.dict('sys.modules', {'whisper': mock_whisper, 'torch': mock_torch}):
+            model = load_whisper_model(config, "cpu")
+
+        mock_torch.compile.assert_called_once()
+        assert model.encoder is mock_torch.compile.return_value
+
+    def test_autocast_flag_wraps_transcribe(self):
+        """whisper.autocast=True routes transcribe through torch.autocast"""
+        config = {"whisper": {"model": "base", "autocast": True}}
+        mock_whisper = MagicMock()
+        mock_torch = MagicMock()
+        mock_torch.cuda.get_device_capability.return_value = (8, 0)
+
+        with patch.dict('sys.modules', {'whisper': mock_whisper, 'torch': mock_torch}):
+            model = load_whisper_model(config, "cuda")
+            model.transcribe("audio.wav")
+
+        mock_torch.autocast.assert_called_once_with("cuda", dtype=mock_torch.bfloat16)
+
+    def test_unknown_backend_rejected(self):
+        """Unknown backend name raises ValueError"""
+        config = {"whisper": {"backend": "turbo"}}
+        with pytest.raises(ValueError):
+            load_whisper_model(config, "cpu")
+
+
+class TestFasterWhisperAdapter:
+    def _fake_model(self, segments, language="ja"):
+        model = MagicMock()
+        model.transcribe.return_value = (iter(segments), SimpleNamespace(language=language))
+        return model
+
+    def test_result_reshaped_to_openai_dict(self):
+        """Segments and words come back in openai-whisper's dict shape"""
+        word = SimpleNamespace(start=0.0, end=0.5, word="テスト", probability=0.9)
+        segment = SimpleNamespace(start=0.0, end=1.0, text="テスト", words=[word])
+        adapter = FasterWhisperAdapter(self._fake_model([segment]))
+
+        result = adapter.transcribe("audio.wav")
+
+        assert result['text'] == "テスト"
+        assert result['language'] == "ja"
+        assert result['segments'][0]['start'] == 0.0
+        assert result['segments'][0]['words'][0]['word'] == "テスト"
+
+    def test_unsupported_params_dropped_and_logprob_renamed(self):
+        """openai-only options are stripped and logprob_threshold is renamed"""
+        model = self._fake_model([])
+        adapter = FasterWhisperAdapter(model)
+
+        adapter.transcribe("audio.wav", verbose=None, fp16=True,
+                           logprob_threshold=-1.5, beam_size=5)
+
+        _, kwargs = model.transcribe.call_args
+        assert 'verbose' not in kwargs
+        assert 'fp16' not in kwargs
+        assert kwargs['log_prob_threshold'] == -1.5
+        assert kwargs['beam_size'] == 5
+
+    def test_batch_size_forwarded_when_batched(self):
+        """Configured batch size is injected into the transcribe call"""
+        model = self._fake_model([])
+        adapter = FasterWhisperAdapter(model, batch_size=16)
+
+        adapter.transcribe("audio.wav")
+
+        _, kwargs = model.transcribe.call_args
+        assert kwargs['batch_size'] == 16
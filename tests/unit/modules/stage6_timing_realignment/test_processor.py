@@ -1,8 +1,8 @@
 """Unit tests for timing realignment processor"""
 
 import pytest
-from unittest.mock import patch, MagicMock, Mock
-import numpy as np
+from types import SimpleNamespace
+from unittest.mock import patch
 from modules.stage6_timing_realignment.processor import realign_timing
 from modules.stage6_timing_realignment.utils import calculate_text_similarity
 from modules.stage6_timing_realignment.text_search_realignment import (
@@ -137,14 +137,14 @@ class TestFindTextInTranscription:
 class TestRealignSegmentTiming:
     """Test single segment timing realignment"""
 
-    def test_very_short_segment_skipped(self, sample_config):
+    def test_very_short_segment_skipped(self, sample_config, fake_audio):
         """Test that very short segments are skipped"""
         config = sample_config.copy()
         config["timing_realignment"] = {"enable": True}
 
         segment = (0.0, 1.0, 'あ', [])
-        audio = np.zeros(16000)  # 1 second of silence
-        model = MagicMock()
+        audio = fake_audio(16000)  # 1 second of silence
+        model = SimpleNamespace()
 
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
@@ -153,20 +153,20 @@ class TestRealignSegmentTiming:
         assert result[1] == 1.0
         assert result[4] is False  # Not adjusted
 
-    def test_audio_segment_too_short_skipped(self, sample_config):
+    def test_audio_segment_too_short_skipped(self, sample_config, fake_audio):
         """Test that segments with insufficient audio are skipped"""
         config = sample_config.copy()
         config["timing_realignment"] = {"enable": True}
 
         segment = (0.0, 0.01, 'こんにちは', [])
-        audio = np.zeros(16000)
-        model = MagicMock()
+        audio = fake_audio(16000)
+        model = SimpleNamespace()
 
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
         assert result[4] is False
 
-    def test_successful_timing_adjustment(self, sample_config):
+    def test_successful_timing_adjustment(self, sample_config, fake_audio):
         """Test successful timing adjustment"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -180,15 +180,12 @@ class TestRealignSegmentTiming:
         }
 
         segment = (1.0, 3.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 10)  # 10 seconds
-        model = MagicMock()
-
-        # Mock Whisper transcription
-        model.transcribe.return_value = {
+        audio = fake_audio(16000 * 10)  # 10 seconds
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 0.5, 'end': 2.5, 'text': 'こんにちは'}
             ]
-        }
+        })
 
         all_segments = [segment]
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, all_segments)
@@ -198,7 +195,7 @@ class TestRealignSegmentTiming:
         # Found at 0.5-2.5, so adjusted to 0.5-2.5
         assert result[4] is True  # Adjusted flag
 
-    def test_minor_adjustment_ignored(self, sample_config):
+    def test_minor_adjustment_ignored(self, sample_config, fake_audio):
         """Test that minor adjustments below threshold are ignored"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -212,21 +209,19 @@ class TestRealignSegmentTiming:
         }
 
         segment = (1.0, 3.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
-
+        audio = fake_audio(16000 * 10)
         # Found very close to original (within threshold)
-        model.transcribe.return_value = {
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 1.1, 'end': 3.1, 'text': 'こんにちは'}
             ]
-        }
+        })
 
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
         assert result[4] is False  # Not adjusted (difference too small)
 
-    def test_config_key_extraction_nested_config(self, sample_config):
+    def test_config_key_extraction_nested_config(self, sample_config, fake_audio):
         """Test that timing_realignment config is correctly extracted"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -237,30 +232,29 @@ class TestRealignSegmentTiming:
         }
 
         segment = (1.0, 3.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 20)
-        model = MagicMock()
-
-        model.transcribe.return_value = {
+        audio = fake_audio(16000 * 20)
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 1.0, 'end': 3.0, 'text': 'さようなら'}  # No match
             ]
-        }
+        })
 
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
         # Should handle config extraction
         assert isinstance(result, tuple)
 
-    def test_transcription_error_returns_unchanged(self, sample_config, capsys):
+    def test_transcription_error_returns_unchanged(self, sample_config, capsys, fake_audio):
         """Test that transcription errors return unchanged segment"""
         config = sample_config.copy()
         config["timing_realignment"] = {"enable": True}
 
         segment = (1.0, 3.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
+        audio = fake_audio(16000 * 10)
+        def _raise(*a, **k):
+            raise Exception("Transcription failed")
 
-        model.transcribe.side_effect = Exception("Transcription failed")
+        model = SimpleNamespace(transcribe=_raise)
 
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
@@ -268,7 +262,7 @@ class TestRealignSegmentTiming:
         captured = capsys.readouterr()
         assert 'Warning: Re-transcription failed' in captured.out
 
-    def test_respects_adjacent_segment_boundaries(self, sample_config):
+    def test_respects_adjacent_segment_boundaries(self, sample_config, fake_audio):
         """Test that adjusted timing respects adjacent segments"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -282,15 +276,13 @@ class TestRealignSegmentTiming:
             (2.4, 3.4, '次の文', [])
         ]
 
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
-
+        audio = fake_audio(16000 * 10)
         # Try to adjust to overlap with previous
-        model.transcribe.return_value = {
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 0.5, 'end': 1.5, 'text': 'こんにちは'}
             ]
-        }
+        })
 
         result = realign_segment_timing_text_search(segments[1], audio, model, config, 1, segments)
 
@@ -309,20 +301,22 @@ class TestRealignTiming:
         config["timing_realignment"] = {"enable": False}
 
         segments = [(0.0, 2.0, 'こんにちは', [])]
-        model = MagicMock()
+        model = SimpleNamespace()
 
         result = realign_timing(segments, model, '/path/to/audio.wav', config)
 
-        assert result == segments
+        # Early return hands back the same list object (no-copy contract)
+        assert result is segments
 
     def test_empty_segments_list(self, sample_config):
         """Test handling of empty segments list"""
         config = sample_config.copy()
         config["timing_realignment"] = {"enable": True}
 
-        result = realign_timing([], MagicMock(), '/path/to/audio.wav', config)
+        segments = []
+        result = realign_timing(segments, SimpleNamespace(), '/path/to/audio.wav', config)
 
-        assert result == []
+        assert result is segments
 
     def test_missing_model_returns_unchanged(self, sample_config, capsys):
         """Test that missing model returns segments unchanged with warning"""
@@ -333,7 +327,7 @@ class TestRealignTiming:
 
         result = realign_timing(segments, None, '/path/to/audio.wav', config)
 
-        assert result == segments
+        assert result is segments
         captured = capsys.readouterr()
         assert 'Warning: Timing realignment requires model' in captured.out
 
@@ -344,9 +338,9 @@ class TestRealignTiming:
 
         segments = [(0.0, 2.0, 'こんにちは', [])]
 
-        result = realign_timing(segments, MagicMock(), None, config)
+        result = realign_timing(segments, SimpleNamespace(), None, config)
 
-        assert result == segments
+        assert result is segments
         captured = capsys.readouterr()
         assert 'Warning: Timing realignment requires model' in captured.out
 
@@ -357,7 +351,7 @@ class TestRealignTiming:
         config["timing_realignment"] = {"enable": True}
 
         segments = [(0.0, 2.0, 'こんにちは', [])]
-        model = MagicMock()
+        model = SimpleNamespace()
 
         mock_load_audio.side_effect = Exception("Failed to load audio")
 
@@ -370,7 +364,7 @@ class TestRealignTiming:
 
     @patch('whisper.load_audio')
     @patch('modules.stage6_timing_realignment.text_search_realignment.realign_segment_timing_text_search')
-    def test_batch_processing(self, mock_realign_seg, mock_load_audio, sample_config, capsys):
+    def test_batch_processing(self, mock_realign_seg, mock_load_audio, sample_config, capsys, fake_audio):
         """Test that segments are processed in batches"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -385,8 +379,8 @@ class TestRealignTiming:
             for i in range(5)
         ]
 
-        model = MagicMock()
-        mock_load_audio.return_value = np.zeros(16000 * 10)
+        model = SimpleNamespace()
+        mock_load_audio.return_value = fake_audio(16000 * 10)
 
         # Mock realign_segment_timing to return unchanged
         def mock_realign(*args):
@@ -404,7 +398,7 @@ class TestRealignTiming:
 
     @patch('whisper.load_audio')
     @patch('modules.stage6_timing_realignment.text_search_realignment.realign_segment_timing_text_search')
-    def test_adjustment_count_reported(self, mock_realign_seg, mock_load_audio, sample_config, capsys):
+    def test_adjustment_count_reported(self, mock_realign_seg, mock_load_audio, sample_config, capsys, fake_audio):
         """Test that adjustment count is reported"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -419,8 +413,8 @@ class TestRealignTiming:
             (2.0, 3.0, 'テキスト3', [])
         ]
 
-        model = MagicMock()
-        mock_load_audio.return_value = np.zeros(16000 * 10)
+        model = SimpleNamespace()
+        mock_load_audio.return_value = fake_audio(16000 * 10)
 
         # First and third adjusted, second not
         call_count = [0]
@@ -443,21 +437,21 @@ class TestRealignTiming:
 class TestEdgeCases:
     """Test edge cases in timing realignment"""
 
-    def test_segment_with_3_tuple_format(self, sample_config):
+    def test_segment_with_3_tuple_format(self, sample_config, fake_audio):
         """Test handling of 3-tuple segment format"""
         config = sample_config.copy()
         config["timing_realignment"] = {"enable": True}
 
         segment = (0.0, 2.0, 'こんにちは')  # 3-tuple
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
+        audio = fake_audio(16000 * 10)
+        model = SimpleNamespace(transcribe=lambda *a, **k: {'segments': []})
 
         # Should handle gracefully by treating as no words
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
         assert len(result) == 5  # Returns 5-tuple
 
-    def test_negative_audio_segment_handling(self, sample_config):
+    def test_negative_audio_segment_handling(self, sample_config, fake_audio):
         """Test handling of negative timing (edge case)"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -466,14 +460,12 @@ class TestEdgeCases:
         }
 
         segment = (0.5, 2.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
-
-        model.transcribe.return_value = {
+        audio = fake_audio(16000 * 10)
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 0.0, 'end': 1.5, 'text': 'こんにちは'}
             ]
-        }
+        })
 
         # Should handle without crashing
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
@@ -485,16 +477,16 @@ class TestEdgeCases:
         config = {}
 
         segments = [(0.0, 2.0, 'こんにちは', [])]
-        result = realign_timing(segments, MagicMock(), '/path/to/audio.wav', config)
+        result = realign_timing(segments, SimpleNamespace(), '/path/to/audio.wav', config)
 
         # Should default to disabled
-        assert result == segments
+        assert result is segments
 
 
 class TestConfigValidation:
     """Test configuration validation"""
 
-    def test_custom_search_padding(self, sample_config):
+    def test_custom_search_padding(self, sample_config, fake_audio):
         """Test custom search_padding configuration"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -503,21 +495,19 @@ class TestConfigValidation:
         }
 
         segment = (5.0, 7.0, 'こんにちは', [])
-        audio = np.zeros(16000 * 20)
-        model = MagicMock()
-
-        model.transcribe.return_value = {
+        audio = fake_audio(16000 * 20)
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 2.0, 'end': 4.0, 'text': 'さようなら'}
             ]
-        }
+        })
 
         # Should use custom padding
         result = realign_segment_timing_text_search(segment, audio, model, config, 0, [segment])
 
         assert isinstance(result, tuple)
 
-    def test_custom_min_gap(self, sample_config):
+    def test_custom_min_gap(self, sample_config, fake_audio):
         """Test custom min_gap configuration"""
         config = sample_config.copy()
         config["timing_realignment"] = {
@@ -530,14 +520,12 @@ class TestConfigValidation:
             (1.5, 2.5, 'こんにちは', [])
         ]
 
-        audio = np.zeros(16000 * 10)
-        model = MagicMock()
-
-        model.transcribe.return_value = {
+        audio = fake_audio(16000 * 10)
+        model = SimpleNamespace(transcribe=lambda *a, **k: {
             'segments': [
                 {'start': 0.8, 'end': 1.8, 'text': 'こんにちは'}
             ]
-        }
+        })
 
         result = realign_segment_timing_text_search(segments[1], audio, model, config, 1, segments)
 
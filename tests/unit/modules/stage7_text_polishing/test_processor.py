@@ -1,7 +1,7 @@
 """Unit tests for text polishing processor"""
 
 import pytest
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch, MagicMock, Mock, AsyncMock
 import json
 from modules.stage7_text_polishing.processor import polish_segments_with_llm
 
@@ -51,8 +51,9 @@ class TestPolishSegmentsWithLLM:
         assert 'Warning: Failed to initialize anthropic provider' in captured.out
         assert 'API key not found' in captured.out
 
+    @patch('anthropic.AsyncAnthropic')
     @patch('anthropic.Anthropic')
-    def test_batch_processing(self, mock_anthropic_class, sample_config):
+    def test_batch_processing(self, mock_anthropic_class, mock_async_class, sample_config):
         """Test that segments are processed in batches"""
         config = sample_config.copy()
         config["text_polishing"]["enable"] = True
@@ -79,10 +80,55 @@ class TestPolishSegmentsWithLLM:
         })
         mock_client.messages.create.return_value = mock_response
 
+        # Multi-batch jobs are dispatched through the async client
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_client.close = AsyncMock()
+
         result = polish_segments_with_llm(segments, config)
 
-        # Should have called API multiple times (once per batch)
-        assert mock_client.messages.create.call_count == 3
+        # Should have called API multiple times (once per batch, completion
+        # order may vary but results are reassembled in order)
+        assert mock_async_client.messages.create.call_count == 3
+        assert len(result) == 7
+
+    @patch('anthropic.AsyncAnthropic')
+    @patch('anthropic.Anthropic')
+    def test_dispatch_paced_in_waves_of_max_concurrency(self, mock_anthropic_class,
+                                                        mock_async_class, sample_config):
+        """Concurrent dispatch goes out one wave at a time, not all at once"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["batch_size"] = 2
+        config["text_polishing"]["max_concurrency"] = 1
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        # 6 segments with batch_size 2 and max_concurrency 1 -> 3 waves
+        segments = [(float(i), float(i + 1), f'テスト{i}', []) for i in range(6)]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["整形後1", "整形後2"]})
+        mock_client.messages.create.return_value = mock_response
+
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_client.close = AsyncMock()
+
+        result = polish_segments_with_llm(segments, config)
+
+        assert len(result) == 6
+        # One generate_many call (and thus one async client) per wave
+        assert mock_async_class.call_count == 3
+        assert mock_async_client.messages.create.call_count == 3
 
     @patch('anthropic.Anthropic')
     def test_config_key_extraction_nested_config(self, mock_anthropic_class, sample_config):
@@ -241,6 +287,45 @@ class TestPolishSegmentsWithLLM:
         assert 'succeeded' in captured.out
         assert 'Completed:' in captured.out
 
+    @patch('anthropic.Anthropic')
+    def test_bisect_retry_isolates_single_bad_segment(self, mock_anthropic_class, sample_config):
+        """Test that bisect retry recovers all but the poisoned segment"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["batch_size"] = 3
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (0.0, 1.0, 'テスト1', []),
+            (1.0, 2.0, 'テスト2', []),  # Poisoned segment
+            (2.0, 3.0, 'テスト3', [])
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        # Any payload containing the poisoned text fails; others succeed
+        def side_effect(*args, **kwargs):
+            prompt = kwargs['messages'][0]['content']
+            if 'テスト2' in prompt:
+                raise Exception("Poisoned segment")
+            mock_response = MagicMock()
+            mock_response.content = [MagicMock()]
+            mock_response.content[0].text = json.dumps({"polished": ["整形後"]})
+            return mock_response
+
+        mock_client.messages.create.side_effect = side_effect
+
+        result = polish_segments_with_llm(segments, config)
+
+        # Good segments recovered, poisoned one keeps original text
+        assert result[0][2] == '整形後'
+        assert result[1][2] == 'テスト2'
+        assert result[2][2] == '整形後'
+
     @patch('anthropic.Anthropic')
     def test_one_by_one_failure_keeps_original(self, mock_anthropic_class, sample_config):
         """Test that individual failures keep original segment"""
@@ -317,12 +402,157 @@ class TestPolishSegmentsWithLLM:
 
         mock_response = MagicMock()
         mock_response.content = [MagicMock()]
-        mock_response.content[0].text = json.dumps({"polished": ["", "テスト。"]})
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
         mock_client.messages.create.return_value = mock_response
 
         result = polish_segments_with_llm(segments, config)
 
         assert len(result) == 2
+        # Empty segments never reach the API; only the non-empty text is sent
+        prompt_sent = mock_client.messages.create.call_args[1]['messages'][0]['content']
+        numbered_section = prompt_sent.split('元のテキスト（音声認識結果）:')[1]
+        assert '1. テスト' in numbered_section
+        assert '2. ' not in numbered_section
+        assert result[0][2] == ''
+        assert result[1][2] == 'テスト。'
+
+    @patch('anthropic.Anthropic')
+    def test_tool_use_returns_structured_list(self, mock_anthropic_class, sample_config):
+        """Test structured output via a forced tool call"""
+        from types import SimpleNamespace
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (0.0, 1.0, 'テスト1', []),
+            (1.0, 2.0, 'テスト2', [])
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [SimpleNamespace(
+            type="tool_use",
+            input={"polished": ["テスト1。", "テスト2。"]}
+        )]
+        mock_client.messages.create.return_value = mock_response
+
+        result = polish_segments_with_llm(segments, config)
+
+        call_kwargs = mock_client.messages.create.call_args[1]
+        assert call_kwargs['tools'][0]['name'] == 'return_polished'
+        assert call_kwargs['tool_choice'] == {'type': 'tool', 'name': 'return_polished'}
+        assert [seg[2] for seg in result] == ['テスト1。', 'テスト2。']
+
+    @patch('anthropic.AsyncAnthropic')
+    @patch('anthropic.Anthropic')
+    def test_multi_batch_forces_tool_call(self, mock_anthropic_class,
+                                          mock_async_class, sample_config):
+        """The concurrent dispatch path also gets structured tool output"""
+        from types import SimpleNamespace
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["batch_size"] = 2
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [(float(i), float(i + 1), f'テスト{i}', []) for i in range(4)]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [SimpleNamespace(
+            type="tool_use",
+            input={"polished": ["整形後1", "整形後2"]}
+        )]
+        mock_client.messages.create.return_value = mock_response
+
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_client.close = AsyncMock()
+
+        result = polish_segments_with_llm(segments, config)
+
+        # Both batches come back through the serialized tool_use input
+        assert [seg[2] for seg in result] == ['整形後1', '整形後2', '整形後1', '整形後2']
+        for call in mock_async_client.messages.create.call_args_list:
+            assert call[1]['tools'][0]['name'] == 'return_polished'
+            assert call[1]['tool_choice'] == {'type': 'tool', 'name': 'return_polished'}
+
+    @patch('anthropic.Anthropic')
+    def test_uses_ephemeral_cache_control(self, mock_anthropic_class, sample_config):
+        """Constant instructions go in a system block marked for prompt caching"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [(0.0, 1.0, 'テスト', [])]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
+        mock_client.messages.create.return_value = mock_response
+
+        polish_segments_with_llm(segments, config)
+
+        call_kwargs = mock_client.messages.create.call_args[1]
+        assert call_kwargs['system'][0]['cache_control'] == {'type': 'ephemeral'}
+        # The per-batch user message carries only the varying segment list
+        assert call_kwargs['messages'][0]['content'].startswith('元のテキスト')
+
+    @patch('anthropic.AsyncAnthropic')
+    @patch('anthropic.Anthropic')
+    def test_multi_batch_keeps_cached_system_block(self, mock_anthropic_class,
+                                                   mock_async_class, sample_config):
+        """The concurrent dispatch path sends the same prompt-cached system block"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["batch_size"] = 2
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        # 4 segments with batch_size 2 take the generate_many path
+        segments = [(float(i), float(i + 1), f'テスト{i}', []) for i in range(4)]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["整形後1", "整形後2"]})
+        mock_client.messages.create.return_value = mock_response
+
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_client.close = AsyncMock()
+
+        result = polish_segments_with_llm(segments, config)
+
+        assert len(result) == 4
+        assert mock_async_client.messages.create.call_count == 2
+        for call in mock_async_client.messages.create.call_args_list:
+            assert call[1]['system'][0]['cache_control'] == {'type': 'ephemeral'}
+            assert call[1]['messages'][0]['content'].startswith('元のテキスト')
 
 
 class TestEdgeCases:
@@ -410,8 +640,10 @@ class TestEdgeCases:
 
         result = polish_segments_with_llm(segments, config)
 
-        # Should handle gracefully
-        assert len(result) <= 3
+        # Nothing dropped or duplicated: segments without a polished
+        # counterpart keep their original text and timing
+        assert [seg[:2] for seg in result] == [seg[:2] for seg in segments]
+        assert [seg[2] for seg in result] == ['整形後1', '整形後2', 'テスト3']
 
     @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'env-test-key'})
     @patch('anthropic.Anthropic')
@@ -441,6 +673,390 @@ class TestEdgeCases:
         mock_anthropic_class.assert_called_with(api_key='env-test-key')
 
 
+class TestBatchApi:
+    """Test the Message Batches API path for large inputs"""
+
+    @patch('anthropic.Anthropic')
+    def test_uses_batch_api_when_threshold_exceeded(self, mock_anthropic_class, sample_config):
+        """Test that large jobs are submitted as one Message Batches job"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["use_batch_api"] = True
+        config["text_polishing"]["batch_api_threshold"] = 3
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (float(i), float(i+1), f'テキスト{i}', [])
+            for i in range(4)
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_batch = MagicMock()
+        mock_batch.id = 'batch-1'
+        mock_batch.processing_status = 'ended'
+        mock_client.messages.batches.create.return_value = mock_batch
+
+        def make_entry(i):
+            entry = MagicMock()
+            entry.custom_id = f'seg-{i}'
+            entry.result.type = 'succeeded'
+            entry.result.message.content[0].text = json.dumps({"polished": [f'整形後{i}']})
+            return entry
+
+        mock_client.messages.batches.results.return_value = [make_entry(i) for i in range(4)]
+
+        result = polish_segments_with_llm(segments, config)
+
+        # One batch submission, no synchronous per-batch calls
+        assert mock_client.messages.batches.create.call_count == 1
+        assert mock_client.messages.create.call_count == 0
+
+        # Each request carries its segment's custom_id
+        requests = mock_client.messages.batches.create.call_args[1]['requests']
+        assert [r['custom_id'] for r in requests] == [f'seg-{i}' for i in range(4)]
+
+        # Results reassembled in order by custom_id
+        assert [seg[2] for seg in result] == [f'整形後{i}' for i in range(4)]
+
+    @patch('anthropic.Anthropic')
+    def test_batch_api_not_used_below_threshold(self, mock_anthropic_class, sample_config):
+        """Test that small jobs keep using synchronous batching"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["use_batch_api"] = True
+        config["text_polishing"]["batch_api_threshold"] = 100
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [(0.0, 1.0, 'テスト', [])]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
+        mock_client.messages.create.return_value = mock_response
+
+        result = polish_segments_with_llm(segments, config)
+
+        assert mock_client.messages.batches.create.call_count == 0
+        assert result[0][2] == 'テスト。'
+
+
+class TestRateLimiter:
+    """Test the token-bucket rate limiter"""
+
+    def _make_limiter(self, rpm, tpm):
+        from modules.stage7_text_polishing.rate_limiter import RateLimiter
+        now = [0.0]
+        sleeps = []
+
+        def clock():
+            return now[0]
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        return RateLimiter(rpm=rpm, tpm=tpm, clock=clock, sleep=sleep), now, sleeps
+
+    def test_acquire_within_budget_does_not_block(self):
+        """Test that calls inside the budget proceed immediately"""
+        limiter, now, sleeps = self._make_limiter(rpm=40, tpm=16000)
+
+        limiter.acquire(tokens=1000)
+        limiter.acquire(tokens=1000)
+
+        assert sleeps == []
+        assert now[0] == 0.0
+
+    def test_rate_limiter_blocks_second_call_when_budget_exhausted(self):
+        """Test that an exhausted token budget forces a refill wait"""
+        limiter, now, sleeps = self._make_limiter(rpm=60, tpm=100)
+
+        limiter.acquire(tokens=100)  # Drains the TPM bucket
+        limiter.acquire(tokens=50)   # Must wait for refill
+
+        assert sleeps
+        # 50 tokens at 100 TPM refill = 30 seconds of waiting
+        assert now[0] >= 30.0
+
+    def test_cost_above_tpm_clamps_instead_of_spinning(self):
+        """A request estimated above the whole TPM budget still terminates"""
+        limiter, now, sleeps = self._make_limiter(rpm=60, tpm=1000)
+
+        # 2000 tokens can never fit a bucket capped at 1000; the clamp lets
+        # the call go through once the bucket is full
+        limiter.acquire(tokens=2000)
+        limiter.acquire(tokens=2000)
+
+        # Second call waits for a full refill rather than looping forever
+        assert now[0] >= 60.0
+
+
+class TestRetryBackoff:
+    """Test the transient-error retry wrapper"""
+
+    @patch('time.sleep')
+    @patch('anthropic.Anthropic')
+    def test_retries_rate_limit_then_succeeds(self, mock_anthropic_class, mock_sleep, sample_config):
+        """Test that 429s are retried with backoff and eventually succeed"""
+        import anthropic
+        from types import SimpleNamespace
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [(0.0, 1.0, 'テスト', [])]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        def rate_limit_error():
+            # Minimal stand-in for the httpx response the SDK attaches
+            response = SimpleNamespace(status_code=429, request=None, headers={})
+            return anthropic.RateLimitError("rate limited", response=response, body=None)
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
+
+        mock_client.messages.create.side_effect = [
+            rate_limit_error(),
+            rate_limit_error(),
+            mock_response
+        ]
+
+        result = polish_segments_with_llm(segments, config)
+
+        # Two 429s retried, third attempt polished the text
+        assert result[0][2] == 'テスト。'
+        assert mock_client.messages.create.call_count == 3
+        assert mock_sleep.call_count == 2
+
+
+class TestResponseCache:
+    """Test the deterministic response cache"""
+
+    @patch('anthropic.Anthropic')
+    def test_cache_hit_skips_api_call(self, mock_anthropic_class, sample_config, tmp_path):
+        """Test that a repeated deterministic request is served from cache"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["cache"] = {"enable": True, "dir": str(tmp_path / "polish_cache")}
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key",
+            "temperature": 0.0
+        }
+
+        segments = [(0.0, 1.0, 'テスト', [])]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
+        mock_client.messages.create.return_value = mock_response
+
+        first = polish_segments_with_llm(segments, config)
+        second = polish_segments_with_llm(segments, config)
+
+        # Second run hits the cache instead of the API
+        assert mock_client.messages.create.call_count == 1
+        assert first[0][2] == 'テスト。'
+        assert second[0][2] == 'テスト。'
+
+    @patch('anthropic.Anthropic')
+    def test_nonzero_temperature_not_cached(self, mock_anthropic_class, sample_config, tmp_path):
+        """Test that sampled (temperature > 0) requests bypass the cache"""
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["cache"] = {"enable": True, "dir": str(tmp_path / "polish_cache")}
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key",
+            "temperature": 0.7
+        }
+
+        segments = [(0.0, 1.0, 'テスト', [])]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト。"]})
+        mock_client.messages.create.return_value = mock_response
+
+        polish_segments_with_llm(segments, config)
+        polish_segments_with_llm(segments, config)
+
+        assert mock_client.messages.create.call_count == 2
+
+
+class TestPackByTokens:
+    """Test token-budget batch packing"""
+
+    def test_short_segments_bounded_by_batch_size(self):
+        """Short segments pack up to the per-batch item ceiling"""
+        from modules.stage7_text_polishing.processor import _pack_by_tokens
+
+        segments = [(i, i + 1, 'テスト') for i in range(7)]
+        batches = _pack_by_tokens(segments, max_input_tokens=3000, max_per_request=3)
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+
+    def test_long_segments_split_by_token_budget(self):
+        """Long segments split before the item ceiling when the budget binds"""
+        from modules.stage7_text_polishing.processor import _pack_by_tokens
+
+        segments = [(i, i + 1, 'あ' * 200) for i in range(4)]
+        # Each segment costs ~101 tokens, so only two fit a 220-token budget
+        batches = _pack_by_tokens(segments, max_input_tokens=220, max_per_request=10)
+
+        assert [len(b) for b in batches] == [2, 2]
+
+
+class TestIterPolished:
+    """Test the lazy polishing generator"""
+
+    @patch('anthropic.Anthropic')
+    def test_iter_polished_is_lazy(self, mock_anthropic_class, sample_config):
+        """Consuming only the first segment issues only the first API call"""
+        from modules.stage7_text_polishing.processor import _iter_polished
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["batch_size"] = 1
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (0.0, 1.0, 'テスト1', []),
+            (1.0, 2.0, 'テスト2', []),
+            (2.0, 3.0, 'テスト3', [])
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["整形後"]})
+        mock_client.messages.create.return_value = mock_response
+
+        first = next(_iter_polished(segments, config))
+
+        assert first[2] == '整形後'
+        assert mock_client.messages.create.call_count == 1
+
+
+class TestCheckpoint:
+    """Test checkpoint persistence and resume"""
+
+    @patch('anthropic.Anthropic')
+    def test_resumes_from_checkpoint(self, mock_anthropic_class, sample_config, tmp_path):
+        """Segments present in the checkpoint skip the API entirely"""
+        checkpoint = tmp_path / "polish_ckpt.jsonl"
+        checkpoint.write_text(json.dumps({"i": 0, "t": "済み。"}, ensure_ascii=False) + "\n",
+                              encoding="utf-8")
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["checkpoint"] = str(checkpoint)
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (0.0, 1.0, 'テスト1', []),
+            (1.0, 2.0, 'テスト2', [])
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["テスト2。"]})
+        mock_client.messages.create.return_value = mock_response
+
+        result = polish_segments_with_llm(segments, config)
+
+        # Only the unpolished segment goes to the API
+        assert mock_client.messages.create.call_count == 1
+        prompt_sent = mock_client.messages.create.call_args[1]['messages'][0]['content']
+        assert 'テスト2' in prompt_sent
+        assert 'テスト1' not in prompt_sent
+
+        assert result[0][2] == '済み。'
+        assert result[1][2] == 'テスト2。'
+
+        # The newly polished segment is appended for future resumes
+        entries = [json.loads(line) for line in checkpoint.read_text(encoding="utf-8").splitlines()]
+        assert {"i": 1, "t": "テスト2。"} in entries
+
+    @patch('anthropic.Anthropic')
+    def test_short_response_checkpoints_correct_indices(self, mock_anthropic_class,
+                                                        sample_config, tmp_path):
+        """A short polished array never records texts against wrong indices"""
+        checkpoint = tmp_path / "polish_ckpt.jsonl"
+
+        config = sample_config.copy()
+        config["text_polishing"]["enable"] = True
+        config["text_polishing"]["checkpoint"] = str(checkpoint)
+        config["llm"] = {
+            "provider": "anthropic",
+            "anthropic_api_key": "test-key"
+        }
+
+        segments = [
+            (0.0, 1.0, 'テスト1', []),
+            (1.0, 2.0, 'テスト2', []),
+            (2.0, 3.0, 'テスト3', [])
+        ]
+
+        mock_client = MagicMock()
+        mock_anthropic_class.return_value = mock_client
+
+        # Response covers only 2 of the 3 segments
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock()]
+        mock_response.content[0].text = json.dumps({"polished": ["整形後1", "整形後2"]})
+        mock_client.messages.create.return_value = mock_response
+
+        result = polish_segments_with_llm(segments, config)
+
+        assert [seg[2] for seg in result] == ['整形後1', '整形後2', 'テスト3']
+
+        # Each checkpoint entry pairs its text with the original index; the
+        # padded third segment records its unchanged text, so a resume
+        # splices every text back into the segment it came from
+        entries = [json.loads(line) for line in checkpoint.read_text(encoding="utf-8").splitlines()]
+        assert entries == [
+            {"i": 0, "t": "整形後1"},
+            {"i": 1, "t": "整形後2"},
+            {"i": 2, "t": "テスト3"},
+        ]
+
+
 class TestConfigValidation:
     """Test configuration validation"""
 
@@ -466,8 +1082,9 @@ class TestConfigValidation:
         # Should handle gracefully
         assert isinstance(result, list)
 
+    @patch('anthropic.AsyncAnthropic')
     @patch('anthropic.Anthropic')
-    def test_default_batch_size(self, mock_anthropic_class, sample_config):
+    def test_default_batch_size(self, mock_anthropic_class, mock_async_class, sample_config):
         """Test that default batch size is used when not specified"""
         config = sample_config.copy()
         config["text_polishing"]["enable"] = True
@@ -488,11 +1105,16 @@ class TestConfigValidation:
         mock_response.content[0].text = json.dumps({"polished": [f"整形後{i}" for i in range(10)]})
         mock_client.messages.create.return_value = mock_response
 
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_client.close = AsyncMock()
+
         result = polish_segments_with_llm(segments, config)
 
         # Should batch with default size (10)
         # Expect 2 API calls (10 + 5)
-        assert mock_client.messages.create.call_count == 2
+        assert mock_async_client.messages.create.call_count == 2
 
     @patch('anthropic.Anthropic')
     def test_batch_size_zero_disables_batching(self, mock_anthropic_class, sample_config, capsys):
@@ -337,6 +337,19 @@ class TestEdgeCases:
 
         assert output_path.exists()
 
+    def test_file_like_output_support(self, sample_config):
+        """Test that file-like objects receive the content directly"""
+        import io
+
+        buffer = io.StringIO()
+        segments = [(0.0, 1.0, 'test', [])]
+
+        write_vtt_file(segments, buffer, sample_config)
+
+        content = buffer.getvalue()
+        assert content.startswith("WEBVTT")
+        assert 'test' in content
+
     def test_millisecond_precision(self, sample_config, tmp_path):
         """Test millisecond precision in timestamps"""
         output_path = tmp_path / "output.vtt"
@@ -0,0 +1,38 @@
+"""Unit tests for the shared Segment record"""
+
+from shared.segment import Segment, as_segment
+
+
+class TestSegment:
+    """Test Segment tuple compatibility"""
+
+    def test_equals_plain_tuple(self):
+        """Segment compares equal to the legacy tuple form"""
+        seg = Segment(0.0, 1.0, 'テスト', [])
+        assert seg == (0.0, 1.0, 'テスト', [])
+
+    def test_index_and_attribute_access(self):
+        """Fields are reachable by index and by name"""
+        seg = Segment(0.5, 2.0, 'テスト', [{'word': 'テスト', 'start': 0.5, 'end': 2.0}])
+        assert seg[2] == seg.text == 'テスト'
+        assert seg[0] == seg.start == 0.5
+        assert len(seg) == 4
+
+    def test_unpacking(self):
+        """Segment unpacks like a 4-tuple"""
+        start, end, text, words = Segment(0.0, 1.0, 'テスト', [])
+        assert (start, end, text, words) == (0.0, 1.0, 'テスト', [])
+
+
+class TestAsSegment:
+    """Test legacy tuple coercion"""
+
+    def test_coerces_three_tuple(self):
+        """3-tuples gain an empty words list"""
+        seg = as_segment((0.0, 1.0, 'テスト'))
+        assert seg == (0.0, 1.0, 'テスト', [])
+
+    def test_passes_through_segment(self):
+        """Existing Segments are returned unchanged"""
+        seg = Segment(0.0, 1.0, 'テスト', [])
+        assert as_segment(seg) is seg
@@ -1,43 +1,43 @@
 """Unit tests for processing.utils module"""
 
 import pytest
-from datetime import timedelta
-from shared.text_utils import format_timestamp, clean_sound_effects, simplify_repetitions, split_long_lines
+from shared.text_utils import (
+    format_timestamp,
+    format_timestamps_bulk,
+    clean_sound_effects,
+    simplify_repetitions,
+    split_long_lines,
+)
 
 
 class TestFormatTimestamp:
     """Test VTT timestamp formatting"""
-    
-    def test_zero_seconds(self):
-        """Test formatting 0 seconds"""
-        assert format_timestamp(0) == "00:00:00.000"
-    
-    def test_one_second(self):
-        """Test formatting 1 second"""
-        assert format_timestamp(1) == "00:00:01.000"
-    
-    def test_one_minute(self):
-        """Test formatting 60 seconds"""
-        assert format_timestamp(60) == "00:01:00.000"
-    
-    def test_one_hour(self):
-        """Test formatting 3600 seconds"""
-        assert format_timestamp(3600) == "01:00:00.000"
-    
-    def test_with_milliseconds(self):
-        """Test formatting with milliseconds"""
-        assert format_timestamp(1.5) == "00:00:01.500"
-        assert format_timestamp(1.123) == "00:00:01.123"
-    
-    def test_complex_time(self):
-        """Test formatting complex timestamp"""
+
+    @pytest.mark.parametrize("seconds,expected", [
+        pytest.param(0, "00:00:00.000", id="zero_seconds"),
+        pytest.param(1, "00:00:01.000", id="one_second"),
+        pytest.param(60, "00:01:00.000", id="one_minute"),
+        pytest.param(3600, "01:00:00.000", id="one_hour"),
+        pytest.param(1.5, "00:00:01.500", id="half_second"),
+        pytest.param(1.123, "00:00:01.123", id="milliseconds"),
         # 1 hour, 23 minutes, 45.678 seconds
-        assert format_timestamp(5025.678) == "01:23:45.678"
-    
-    def test_fractional_seconds(self):
-        """Test various fractional seconds"""
-        assert format_timestamp(0.001) == "00:00:00.001"
-        assert format_timestamp(0.999) == "00:00:00.999"
+        pytest.param(5025.678, "01:23:45.678", id="complex_time"),
+        pytest.param(0.001, "00:00:00.001", id="one_millisecond"),
+        pytest.param(0.999, "00:00:00.999", id="just_under_one_second"),
+        pytest.param(-1.5, "00:00:00.000", id="negative_clamped_to_zero"),
+    ])
+    def test_format_timestamp(self, seconds, expected):
+        """Seconds convert to the expected HH:MM:SS.mmm string"""
+        assert format_timestamp(seconds) == expected
+
+    def test_bulk_matches_scalar(self):
+        """Vectorized formatting agrees with the scalar function"""
+        values = [0, 1, 60, 3600, 1.5, 5025.678, 0.001, 0.999, -1.5]
+        assert list(format_timestamps_bulk(values)) == [format_timestamp(v) for v in values]
+
+    def test_bulk_empty_input(self):
+        """Empty input yields an empty result"""
+        assert len(format_timestamps_bulk([])) == 0
 
 
 class TestCleanSoundEffects:
@@ -16,29 +16,27 @@ This tool uses a 9-stage processing pipeline:
 Supports: WAV, MP3, M4A, AAC, FLAC, OGG, MP4, AVI, MKV, MOV, WMV, FLV, and more.
 """
 
-import whisper
 import os
 from pathlib import Path
-import torch
 import sys
 import argparse
+import logging
 
 from core.config import load_config, validate_llm_requirements
+from core.whisper_backend import load_whisper_model
 from core.pipeline import run_pipeline
 from core.display import display_pipeline_summary
 from shared.text_utils import check_ffmpeg
 
-# Check for ffmpeg
-if not check_ffmpeg():
-    print("ERROR: ffmpeg not found!")
-    print("\nPlease install ffmpeg using one of these methods:")
-    print("  1. Chocolatey: choco install ffmpeg")
-    print("  2. Winget: winget install ffmpeg")
-    print("  3. Manual: https://github.com/BtbN/FFmpeg-Builds/releases")
-    print("\nAfter installation, restart your terminal.")
-    sys.exit(1)
-
-def transcribe_media_file(media_path, model, output_dir, config):
+log = logging.getLogger("transcribe_jp")
+
+# Supported media extensions, matched case-insensitively in a single
+# directory sweep instead of one glob walk per pattern
+AUDIO_EXTS = ('wav', 'mp3', 'm4a', 'aac', 'flac', 'ogg', 'wma', 'opus')
+VIDEO_EXTS = ('mp4', 'avi', 'mkv', 'mov', 'wmv', 'flv', 'webm', 'm4v')
+MEDIA_EXTS = frozenset(AUDIO_EXTS + VIDEO_EXTS)
+
+def transcribe_media_file(media_path, model, output_dir, config, preprocessed=None):
     """
     Transcribe a single audio/video file using the 9-stage pipeline.
 
@@ -58,11 +56,12 @@ def transcribe_media_file(media_path, model, output_dir, config):
         model: Loaded Whisper model
         output_dir: Directory for output VTT files
         config: Configuration dict from config.json
+        preprocessed: Optional prefetched Stage 1 result
 
     Returns:
         Path to generated VTT file
     """
-    vtt_path = run_pipeline(media_path, model, output_dir, config)
+    vtt_path = run_pipeline(media_path, model, output_dir, config, preprocessed)
     return vtt_path
 
 def main():
@@ -96,8 +95,31 @@ Supported formats: WAV, MP3, M4A, AAC, FLAC, OGG, MP4, AVI, MKV, MOV, and more
     parser.add_argument('files', nargs='*', help='Specific media files to process (optional)')
     parser.add_argument('--config', type=str, help='Path to config.json file')
     parser.add_argument('--output-dir', type=str, help='Output directory for VTT files')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep the loaded model resident and serve jobs over a Unix socket')
+    parser.add_argument('--client', action='store_true',
+                        help='Submit files to a running --daemon instead of loading a model')
+    parser.add_argument('--socket', type=str, help='Unix socket path for --daemon/--client')
     args = parser.parse_args()
 
+    # Configure only this module's logger. basicConfig would install a root
+    # handler, and the shared "transcribe-jp" logger propagates - its
+    # file-only INFO records would start echoing to the console on every run
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+    # Check for ffmpeg only once arguments parsed, so --help stays instant
+    if not check_ffmpeg():
+        print("ERROR: ffmpeg not found!")
+        print("\nPlease install ffmpeg using one of these methods:")
+        print("  1. Chocolatey: choco install ffmpeg")
+        print("  2. Winget: winget install ffmpeg")
+        print("  3. Manual: https://github.com/BtbN/FFmpeg-Builds/releases")
+        print("\nAfter installation, restart your terminal.")
+        sys.exit(1)
+
     # Load configuration
     config = load_config(args.config) if args.config else load_config()
 
@@ -120,33 +142,55 @@ Supported formats: WAV, MP3, M4A, AAC, FLAC, OGG, MP4, AVI, MKV, MOV, and more
         output_dir = current_dir / output_dir_name
     output_dir.mkdir(exist_ok=True)
 
-    # Define supported media formats
-    audio_formats = ['*.wav', '*.mp3', '*.m4a', '*.aac', '*.flac', '*.ogg', '*.wma', '*.opus']
-    video_formats = ['*.mp4', '*.avi', '*.mkv', '*.mov', '*.wmv', '*.flv', '*.webm', '*.m4v']
-    all_formats = audio_formats + video_formats
-
-    # Find media files
-    if args.files:
+    # Client mode: hand files to a resident daemon, no local model load
+    if args.client:
+        from core.daemon import DEFAULT_SOCKET_PATH, submit_job
+        socket_path = args.socket or DEFAULT_SOCKET_PATH
+        if not args.files:
+            print("ERROR: --client requires explicit media files")
+            return
+        for i, media_file in enumerate(args.files, 1):
+            print(f"\n[{i}/{len(args.files)}] {media_file}")
+            response = submit_job(media_file, socket_path=socket_path)
+            if response.get("ok"):
+                print(f"  - Created: {response['vtt']}")
+            else:
+                print(f"  - ERROR: {response.get('error')}")
+        return
+
+    # Find media files (daemon mode receives them per job instead)
+    if args.daemon:
+        media_files = []
+    elif args.files:
         # Process specific files provided as arguments
         media_files = [Path(f) for f in args.files if Path(f).exists()]
         if not media_files:
             print(f"ERROR: None of the specified files exist!")
             return
     else:
-        # Find all media files in current directory
-        media_files = []
-        for pattern in all_formats:
-            media_files.extend(current_dir.glob(pattern))
-        media_files = sorted(set(media_files))  # Remove duplicates and sort
+        # Find all media files in current directory with one scandir sweep:
+        # a single readdir pass instead of one glob walk per extension
+        with os.scandir(current_dir) as entries:
+            media_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and '.' in entry.name
+                and entry.name.rpartition('.')[2].lower() in MEDIA_EXTS
+            )
 
         if not media_files:
             print("No supported media files found in current directory!")
-            print(f"Supported formats: {', '.join(all_formats)}")
+            print(f"Supported formats: {', '.join('*.' + ext for ext in AUDIO_EXTS + VIDEO_EXTS)}")
             return
 
-    print(f"Found {len(media_files)} media file(s)")
+    if not args.daemon:
+        print(f"Found {len(media_files)} media file(s)")
     print(f"Output directory: {output_dir}")
 
+    # Deferred import: torch takes seconds to load, so only invocations that
+    # actually reach model setup pay for it
+    import torch
+
     # Check for CUDA
     whisper_config = config.get("whisper", {})
     device_config = whisper_config.get("device", "auto")
@@ -163,22 +207,42 @@ Supported formats: WAV, MP3, M4A, AAC, FLAC, OGG, MP4, AVI, MKV, MOV, and more
     model_name = whisper_config.get("model", "large-v3")
     print(f"\nLoading Whisper model: {model_name}")
     print("Available models: tiny, base, small, medium, large, large-v2, large-v3")
-    model = whisper.load_model(model_name, device=device)
+    model = load_whisper_model(config, device)
 
     # Display pipeline configuration
     display_pipeline_summary(config)
 
-    # Process each media file
+    # Daemon mode: keep the warm model resident and serve jobs over a socket
+    if args.daemon:
+        from core.daemon import DEFAULT_SOCKET_PATH, run_daemon
+        run_daemon(model, output_dir, config,
+                   socket_path=args.socket or DEFAULT_SOCKET_PATH)
+        return
+
+    # Process each media file. A one-deep prefetch overlaps the next file's
+    # ffmpeg preprocessing (CPU/disk-bound) with the current file's Whisper
+    # inference (GPU-bound)
+    from concurrent.futures import ThreadPoolExecutor
+    from modules.stage1_audio_preprocessing.processor import preprocess_audio_volume
+
     print("\n" + "="*60)
-    for i, media_file in enumerate(media_files, 1):
-        print(f"\n[{i}/{len(media_files)}]")
-        try:
-            transcribe_media_file(media_file, model, output_dir, config)
-        except Exception as e:
-            print(f"  - ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        next_prep = None
+        for i, media_file in enumerate(media_files, 1):
+            prep = next_prep
+            if i < len(media_files):
+                next_prep = prefetcher.submit(
+                    preprocess_audio_volume, media_files[i], config, output_dir)
+            else:
+                next_prep = None
+
+            print(f"\n[{i}/{len(media_files)}]")
+            try:
+                preprocessed = prep.result() if prep is not None else None
+                transcribe_media_file(media_file, model, output_dir, config, preprocessed)
+            except Exception:
+                log.exception("Failed processing %s", media_file)
+                continue
 
     print("\n" + "="*60)
     print("\nProcessing complete!")